@@ -4,19 +4,29 @@ Token Authorization Module
 This module handles the token-based authentication for the application. It provides an endpoint for clients
 to obtain access tokens using the OAuth2 password flow. Clients can provide a username and password to
 receive an access token in return. This token can then be used to access other protected endpoints.
+
+The user lookup goes through the async database session. Password verification is CPU-bound (bcrypt), so
+it runs in a dedicated, size-limited worker pool. When that pool is saturated the endpoint answers 503 instead of queueing, which
+keeps a burst of logins from stalling the rest of the API.
+
+Login attempts are rate-limited per client IP and per username, and repeated failures lock both out for a
+while. Throttled attempts are answered with 429 before the database or bcrypt is touched.
 """
 
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import config
+from app.core.rate_limit import client_address, login_limiter, login_lockout
 from app.core.security import authenticate_user, create_access_token
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.schemas.token import Token
+from app.utils.executors import BoundedExecutor, PoolFullError
 from app.utils.logger import configure_logger
+from app.utils.metrics import auth_failures
 
 # Setup logging
 logger = configure_logger()
@@ -25,10 +35,19 @@ router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/admin/token")
 
+# Dedicated pool for password verification, separate from the default threadpool.
+auth_executor = BoundedExecutor(
+    max_workers=config.AUTH_WORKERS,
+    max_pending=config.AUTH_QUEUE_SIZE,
+    thread_name_prefix="auth",
+)
+
 
 @router.post("/token", response_model=Token, summary="Get authorization token")
 async def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Authenticate the user.
@@ -37,24 +56,63 @@ async def login_for_access_token(
     and if successful, return an access token. The token can then be used to access protected routes.
 
     Args:
+    - request (Request): The incoming request, used to identify the client.
     - form_data (OAuth2PasswordRequestForm): A form with fields `username` and `password`.
+    - db (AsyncSession): The database session used to look up the user.
 
     Returns:
     - dict: A dictionary containing the access token and token type ("bearer").
 
     Raises:
-    - HTTPException: If authentication fails.
+    - HTTPException: If authentication fails, with status 429 if the client or user is throttled, or with
+      status 503 if the authentication pool is busy.
     """
+    client_key = ("ip", client_address(request.scope))
+    user_key = ("user", form_data.username)
+
+    # Reject throttled clients before any database or bcrypt work.
+    retry_after = max(
+        login_lockout.locked_for(client_key),
+        login_lockout.locked_for(user_key),
+        login_limiter.acquire(client_key),
+        login_limiter.acquire(user_key),
+    )
+    if retry_after:
+        auth_failures.inc("rate_limited")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
     # Authenticate the user with the provided username and password.
-    user = authenticate_user(db, form_data.username, form_data.password)
+    try:
+        user = await authenticate_user(
+            db, form_data.username, form_data.password, auth_executor
+        )
+    except PoolFullError:
+        logger.warning("Authentication pool is saturated, rejecting login")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login attempts, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
     if not user:
+        auth_failures.inc("bad_credentials")
         logger.warning("Incorrect username or password")
+        for key in (client_key, user_key):
+            if login_lockout.record_failure(key):
+                logger.warning(
+                    f"Locking out {key[0]} {key[1]} after repeated failed logins"
+                )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    login_lockout.reset(user_key)
+
     access_token_expires = timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": form_data.username}, expires_delta=access_token_expires
@@ -0,0 +1,39 @@
+"""
+Metrics Module
+
+Exposes the application metrics at `/metrics` in the Prometheus text exposition format.
+
+The endpoint requires a bearer token of a user with the `metrics_read` permission, which Prometheus can send
+with its `authorization` scrape setting. Set `METRICS_PUBLIC=yes` to serve it without authentication, e.g.
+when the port is only reachable from the monitoring network.
+
+With several worker processes the response merges the metrics of every worker; the values of the other
+workers can be up to `METRICS_FLUSH_INTERVAL` seconds old.
+"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import METRICS_PUBLIC
+from app.core.permissions import METRICS_READ
+from app.dependencies.token_dependency import require_permission
+from app.utils.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Application metrics",
+    dependencies=[] if METRICS_PUBLIC else [Depends(require_permission(METRICS_READ))],
+)
+async def metrics() -> PlainTextResponse:
+    """
+    Endpoint to export request latency, authentication failures, database and command durations and
+    in-flight requests of all worker processes.
+
+    Returns:
+        PlainTextResponse: The metrics in the Prometheus text format, version 0.0.4.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
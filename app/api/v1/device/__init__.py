@@ -1,6 +1,7 @@
 # app/api/v1/device/__init__.py
 
 
+from .batch import *
 from .get_hostname import *
 from .get_info import *
 from .get_interface_by_name import *
@@ -9,5 +10,6 @@ from .get_system_resources import *
 from .get_time import *
 from .set_hostname import *
 from .set_ip_settings import *
+from .set_network_state import *
 from .set_timezone import *
 from .set_wifi import *
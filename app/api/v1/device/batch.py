@@ -0,0 +1,93 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.api.v1.device.get_hostname import fetch_hostname
+from app.api.v1.device.get_info import get_device_info
+from app.api.v1.device.get_interfaces import get_interfaces_info
+from app.api.v1.device.get_system_resources import collect_system_resources
+from app.api.v1.device.get_time import get_system_time_details
+from app.collectors.resources import extended_resources
+from app.core.permissions import DEVICE_READ
+from app.dependencies.token_dependency import require_permission
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.utils.logger import configure_logger
+
+# Setup logging
+logger = configure_logger()
+
+router = APIRouter()
+
+
+async def _threaded(func: Callable[[], Any]) -> Any:
+    return await run_in_threadpool(func)
+
+
+# Collector for every query name accepted in `BatchRequest.queries`.
+BATCH_COLLECTORS: Dict[str, Callable[[], Awaitable[Any]]] = {
+    "info": lambda: _threaded(get_device_info),
+    "hostname": lambda: _threaded(lambda: {"hostname": fetch_hostname()}),
+    "clock": get_system_time_details,
+    "interfaces": lambda: _threaded(lambda: {"interfaces": get_interfaces_info()}),
+    "system_resources": lambda: _threaded(collect_system_resources),
+    "system_resources_extended": lambda: _threaded(extended_resources.collect),
+}
+
+
+async def run_batch(queries) -> dict:
+    """
+    Run the requested device collectors concurrently.
+
+    A failing collector does not fail the batch; its error message is reported under `errors` instead.
+
+    Args:
+        queries (list): The query names to run. Duplicates are run once.
+
+    Returns:
+        dict: A dictionary with `results` and `errors`, both keyed by query name.
+    """
+    names = list(dict.fromkeys(queries))
+    outcomes = await asyncio.gather(
+        *(BATCH_COLLECTORS[name]() for name in names), return_exceptions=True
+    )
+
+    results, errors = {}, {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, HTTPException):
+            errors[name] = str(outcome.detail)
+        elif isinstance(outcome, Exception):
+            logger.error(f"Error running batch query '{name}': {outcome}")
+            errors[name] = "Failed to collect data."
+        else:
+            results[name] = outcome
+    return {"results": results, "errors": errors}
+
+
+@router.post(
+    "/device/batch",
+    response_model=BatchResponse,
+    summary="Run several device queries at once",
+)
+async def device_batch(
+    batch: BatchRequest, current_user: str = Depends(require_permission(DEVICE_READ))
+) -> dict:
+    """
+    Endpoint answering several read-only device queries in a single request.
+
+    A dashboard refresh that would otherwise call `/device/info`, `/device/hostname`, `/device/clock`,
+    `/device/interfaces` and `/system-resources` separately can request them together: the token is
+    verified once and the collectors run concurrently.
+
+    Parameters:
+        batch (BatchRequest): The names of the queries to run.
+        current_user (str): The authenticated user's name/ID.
+
+    Returns:
+        dict: The results of the successful queries and an error message for each failed one.
+
+    Raises:
+        HTTPException: If the user is not authenticated.
+    """
+    return await run_batch(batch.queries)
@@ -1,9 +1,11 @@
 import platform
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
-from app.dependencies.token_dependency import get_current_user
+from app.core.permissions import DEVICE_READ
+from app.dependencies.token_dependency import require_permission
 from app.schemas.info import HostnameResponse
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
 
 router = APIRouter()
 
@@ -19,11 +21,20 @@ def fetch_hostname() -> str:
 
 
 @router.get("/device/hostname", response_model=HostnameResponse, summary="Get hostname")
-async def hostname_info(current_user: str = Depends(get_current_user)) -> dict:
+async def hostname_info(
+    request: Request,
+    response: Response,
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+) -> dict:
     """
     Endpoint to fetch the system's hostname.
 
+    The response carries an `ETag` of the hostname; a request whose `If-None-Match` matches it is answered
+    with 304.
+
     Parameters:
+        request (Request): The incoming request.
+        response (Response): The outgoing response, used to set the caching headers.
         current_user (str): The authenticated user's name/ID.
 
     Returns:
@@ -32,4 +43,9 @@ async def hostname_info(current_user: str = Depends(get_current_user)) -> dict:
     Raises:
         HTTPException: If the user is not authenticated.
     """
-    return {"hostname": fetch_hostname()}
+    hostname = fetch_hostname()
+    etag = make_etag(hostname)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return {"hostname": hostname}
@@ -2,30 +2,42 @@ import os
 import platform
 import uuid
 from datetime import datetime
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
-# If you want more detailed network information
-import psutil
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
-from app.dependencies.token_dependency import get_current_user
+from app.collectors.interfaces import interface_snapshot
+from app.core.permissions import DEVICE_READ
+from app.dependencies.token_dependency import require_permission
 from app.schemas.info import SystemInfoResponse
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.serialization import TrustedJSONResponse
+from app.utils.shared_state import shared_generations
 
 router = APIRouter()
 
+HOSTNAME_PATH = "/etc/hostname"
+CURRENT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-def get_device_info() -> Dict[str, str]:
+# Last hostname read from HOSTNAME_PATH together with its (generation, inode, mtime) stamp.
+_hostname_cache: Dict[str, Tuple[Optional[tuple], str]] = {}
+
+
+@lru_cache(maxsize=None)
+def get_static_device_facts() -> Dict[str, str]:
     """
-    Get general information of the device.
+    Get the device facts that cannot change while the application is running.
+
+    The values are computed once, normally at startup, and reused by every request.
 
     Returns:
-        dict: A dictionary containing general device information such as hostname, os, release, etc.
+        dict: A dictionary containing the uuid, os, release, version, architecture, cpu and memory.
     """
-    info = {
+    return {
         "uuid": str(
             uuid.UUID(int=uuid.getnode())
         ),  # Get UUID based on the machine's hardware address
-        "hostname": get_hostname_from_file(),
         "os": platform.system(),
         "release": platform.release(),
         "version": platform.version(),
@@ -34,19 +46,65 @@ def get_device_info() -> Dict[str, str]:
         "memory": "{:.2f} GB".format(
             os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024.0**3)
         ),
-        "current_time": datetime.now().strftime(
-            "%Y-%m-%d %H:%M:%S"
+    }
+
+
+def get_device_info(now: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Get general information of the device.
+
+    Static facts come from `get_static_device_facts`; only the hostname, time and interfaces are
+    collected per request.
+
+    Parameters:
+        now (datetime, optional): The time to report as `current_time`. Defaults to the current local time.
+
+    Returns:
+        dict: A dictionary containing general device information such as hostname, os, release, etc.
+    """
+    facts = get_static_device_facts()
+    info = {
+        "uuid": facts["uuid"],
+        "hostname": get_hostname_from_file(),
+        "os": facts["os"],
+        "release": facts["release"],
+        "version": facts["version"],
+        "architecture": facts["architecture"],
+        "cpu": facts["cpu"],
+        "memory": facts["memory"],
+        "current_time": (now or datetime.now()).strftime(
+            CURRENT_TIME_FORMAT
         ),  # Get current time
         "network_interfaces": {
-            interface: address for interface, address in psutil.net_if_addrs().items()
+            name: [list(address) for address in record.addresses]
+            for name, record in interface_snapshot.get().items()
         },  # Get network interfaces
     }
     return info
 
 
 def get_hostname_from_file() -> str:
-    with open("/etc/hostname", "r") as f:
-        return f.read().strip()
+    """
+    Get the hostname from /etc/hostname, re-reading the file only when it has changed or a worker
+    updated the hostname.
+
+    Returns:
+        str: The configured hostname.
+    """
+    try:
+        st = os.stat(HOSTNAME_PATH)
+        stamp = (shared_generations.get("hostname"), st.st_ino, st.st_mtime_ns)
+    except OSError:
+        stamp = None
+
+    cached = _hostname_cache.get(HOSTNAME_PATH)
+    if cached is not None and stamp is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(HOSTNAME_PATH, "r") as f:
+        hostname = f.read().strip()
+    _hostname_cache[HOSTNAME_PATH] = (stamp, hostname)
+    return hostname
 
 
 @router.get(
@@ -54,19 +112,37 @@ def get_hostname_from_file() -> str:
     response_model=SystemInfoResponse,
     summary="Get general os information",
 )
-async def device_info(current_user: str = Depends(get_current_user)) -> Dict[str, str]:
+async def device_info(
+    request: Request,
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+) -> TrustedJSONResponse:
     """
     Endpoint to fetch the device's general information.
 
+    The `ETag` is derived from the hostname, the interface snapshot and the current second, which the
+    response reports; a repeated poll with nothing changed is answered with 304. The body is encoded
+    without validation against `SystemInfoResponse`, which it matches by construction.
+
     Parameters:
+        request (Request): The incoming request.
         user (str, optional): The authenticated user's name/ID. Defaults to Depends on(verify_token).
 
     Returns:
-        dict: A dictionary containing the device's general information.
+        TrustedJSONResponse: The device's general information.
 
     Raises:
         HTTPException: If the user is not authenticated.
         :param current_user:
     """
-
-    return get_device_info()
+    interface_snapshot.get()
+    # The tag and the body report the same second, read once.
+    now = datetime.now()
+    etag = make_etag(
+        get_static_device_facts(),
+        get_hostname_from_file(),
+        now.strftime(CURRENT_TIME_FORMAT),
+        interface_snapshot.etag,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return TrustedJSONResponse(get_device_info(now), headers=etag_headers(etag))
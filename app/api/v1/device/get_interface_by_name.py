@@ -1,47 +1,45 @@
-import psutil
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
-from app.dependencies.token_dependency import get_current_user
+from app.collectors.interfaces import interface_snapshot
+from app.core.permissions import DEVICE_READ
+from app.dependencies.token_dependency import require_permission
 from app.schemas.interfaces import InterfaceDetail
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.serialization import TrustedJSONResponse
 
 router = APIRouter()
 
 
-def get_interface_detail_by_name(interface_name: str) -> dict:
+def get_interface_record(interface_name: str):
     """
-    Get information about a specific network interface using psutil.
+    Get the record of a specific network interface from the shared interface snapshot.
 
     Args:
         interface_name (str): The name of the interface.
 
     Returns:
-        dict: A dictionary containing details for the specified network interface.
+        InterfaceRecord: The record of the interface.
+
+    Raises:
+        HTTPException: If the interface does not exist or has no addresses.
     """
-    addrs = psutil.net_if_addrs().get(interface_name)
-    if not addrs:
+    record = interface_snapshot.get_interface(interface_name)
+    if record is None or not record.addresses:
         raise HTTPException(status_code=404, detail="Interface not found")
+    return record
+
+
+def get_interface_detail_by_name(interface_name: str) -> dict:
+    """
+    Get information about a specific network interface from the shared interface snapshot.
 
-    addresses = []
-    for addr in addrs:
-        addresses.append(
-            {
-                "family": str(addr.family),
-                "address": addr.address,
-                "netmask": addr.netmask,
-                "broadcast": addr.broadcast,
-                "ptp": addr.ptp,
-            }
-        )
-
-    stats = psutil.net_if_stats().get(interface_name)
-    stats_detail = {
-        "speed": stats.speed,
-        "duplex": str(stats.duplex),
-        "mtu": stats.mtu,
-        "isup": stats.isup,
-    }
-
-    return {"addresses": addresses, "stats": stats_detail}
+    Args:
+        interface_name (str): The name of the interface.
+
+    Returns:
+        dict: A dictionary containing details for the specified network interface.
+    """
+    return get_interface_record(interface_name).as_dict()
 
 
 @router.get(
@@ -50,19 +48,30 @@ def get_interface_detail_by_name(interface_name: str) -> dict:
     summary="Get interface detail by interaface name",
 )
 async def interface_info_by_name(
-    interface_name: str, current_user: str = Depends(get_current_user)
-) -> dict:
+    interface_name: str,
+    request: Request,
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+) -> TrustedJSONResponse:
     """
     Endpoint to fetch information about a specific network interface using psutil.
 
+    The response carries an `ETag` of the interface record; a request whose `If-None-Match` matches it is
+    answered with 304 without building the body. The body is encoded without validation against
+    `InterfaceDetail`, which it matches by construction.
+
     Parameters:
         interface_name (str): The name of the interface.
+        request (Request): The incoming request.
         current_user (str): The authenticated user's name/ID.
 
     Returns:
-        dict: A dictionary containing details for the specified network interface.
+        TrustedJSONResponse: Details for the specified network interface.
 
     Raises:
         HTTPException: If the interface is not found or the user is not authenticated.
     """
-    return get_interface_detail_by_name(interface_name)
+    record = get_interface_record(interface_name)
+    etag = make_etag(record)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return TrustedJSONResponse(record.as_dict(), headers=etag_headers(etag))
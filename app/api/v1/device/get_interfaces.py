@@ -1,44 +1,27 @@
-import psutil
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 
-from app.dependencies.token_dependency import get_current_user
+from app.collectors.interface_watcher import interface_watcher
+from app.collectors.interfaces import interface_snapshot
+from app.core.config import STREAM_HEARTBEAT
+from app.core.permissions import DEVICE_READ
+from app.dependencies.token_dependency import require_permission
 from app.schemas.interfaces import InterfacesResponse
+from app.utils.broadcast import sse_event
+from app.utils.etag import etag_headers, etag_matches, not_modified
+from app.utils.serialization import TrustedJSONResponse
 
 router = APIRouter()
 
 
 def get_interfaces_info() -> dict:
     """
-    Get information about all available network interfaces using psutil.
+    Get information about all available network interfaces from the shared interface snapshot.
 
     Returns:
         dict: A dictionary containing details for each network interface.
     """
-    interfaces_info = {}
-    for interface, addrs in psutil.net_if_addrs().items():
-        addresses = []
-        for addr in addrs:
-            addresses.append(
-                {
-                    "family": str(addr.family),
-                    "address": addr.address,
-                    "netmask": addr.netmask,
-                    "broadcast": addr.broadcast,
-                    "ptp": addr.ptp,
-                }
-            )
-
-        stats = psutil.net_if_stats()[interface]
-        stats_detail = {
-            "speed": stats.speed,
-            "duplex": str(stats.duplex),
-            "mtu": stats.mtu,
-            "isup": stats.isup,
-        }
-
-        interfaces_info[interface] = {"addresses": addresses, "stats": stats_detail}
-
-    return interfaces_info
+    return {name: record.as_dict() for name, record in interface_snapshot.get().items()}
 
 
 @router.get(
@@ -46,17 +29,63 @@ def get_interfaces_info() -> dict:
     response_model=InterfacesResponse,
     summary="Get all available interfaces",
 )
-async def interfaces_info(current_user: str = Depends(get_current_user)) -> dict:
+async def interfaces_info(
+    request: Request,
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+) -> TrustedJSONResponse:
     """
     Endpoint to fetch information about all available network interfaces using psutil.
 
+    The response carries the snapshot's `ETag`; a request whose `If-None-Match` matches it is answered with
+    304 without building the body. Otherwise the snapshot's pre-encoded body is sent without validation.
+
     Parameters:
+        request (Request): The incoming request.
         current_user (str): The authenticated user's name/ID.
 
     Returns:
-        dict: A dictionary containing details for each network interface.
+        TrustedJSONResponse: The `InterfacesResponse` document with details for each network interface.
 
     Raises:
         HTTPException: If the user is not authenticated.
     """
-    return {"interfaces": get_interfaces_info()}
+    etag, body = interface_snapshot.body()
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return TrustedJSONResponse(body, headers=etag_headers(etag))
+
+
+@router.get(
+    "/device/interfaces/events",
+    summary="Stream network interface changes",
+    response_class=StreamingResponse,
+)
+async def interfaces_events(
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+):
+    """
+    Endpoint streaming the interface table as Server-Sent Events.
+
+    The current table is sent immediately as an `interfaces` event, followed by a new event every time
+    the kernel reports a link or address change. Requires the netlink interface watcher; without it only
+    the initial table and keep-alives are sent.
+
+    Parameters:
+        current_user (str): The authenticated user's name/ID.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response with `InterfacesResponse` payloads.
+
+    Raises:
+        HTTPException: If the user is not authenticated.
+    """
+
+    async def event_stream():
+        if not interface_watcher.running:
+            yield sse_event(interface_snapshot.body()[1].decode(), event="interfaces")
+        async for payload in interface_watcher.events.subscribe(
+            heartbeat=STREAM_HEARTBEAT
+        ):
+            yield sse_event(payload, event="interfaces")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
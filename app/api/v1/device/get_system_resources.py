@@ -1,20 +1,70 @@
 import psutil
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.dependencies.token_dependency import get_current_user
-from app.schemas.system_resources import SystemResources
+from app.collectors.resources import extended_resources, resource_sampler
+from app.core.config import STREAM_HEARTBEAT
+from app.core.permissions import DEVICE_READ
+from app.dependencies.token_dependency import require_permission
+from app.schemas.system_resources import (
+    ExtendedSystemResources,
+    ResourceHistory,
+    SystemResources,
+)
+from app.utils.broadcast import sse_event
+from app.utils.metrics import collector_duration
 
 # Create a new API router instance to handle routes related to system resources.
 router = APIRouter()
 
 
+def collect_system_resources() -> SystemResources:
+    """
+    Get the current CPU, memory and root-partition disk usage.
+
+    Returns:
+        SystemResources: An object containing the system's resource utilization details,
+                         including CPU, memory, and disk usage percentages.
+    """
+
+    # Serve the background sampler's latest reading when it is running, instead of new syscalls.
+    sample = resource_sampler.fresh_sample()
+    if sample is not None:
+        return SystemResources(
+            cpu_usage_percent=sample["cpu_usage_percent"],
+            memory_usage_percent=sample["memory_usage_percent"],
+            disk_usage_percent=sample["disk_usage_percent"],
+        )
+
+    with collector_duration.time("system_resources"):
+        # Get the current CPU usage as a percentage.
+        cpu_usage_percent = psutil.cpu_percent()
+
+        # Get the current memory usage as a percentage.
+        memory_usage_percent = psutil.virtual_memory().percent
+
+        # Get the current disk usage as a percentage.
+        # This specifically checks the root partition '/'.
+        disk_usage_percent = psutil.disk_usage("/").percent
+
+    # Return the gathered resource information packaged in a SystemResources response model.
+    return SystemResources(
+        cpu_usage_percent=cpu_usage_percent,
+        memory_usage_percent=memory_usage_percent,
+        disk_usage_percent=disk_usage_percent,
+    )
+
+
 @router.get(
     "/system-resources", response_model=SystemResources, summary="Get system resources"
 )
 # Define an endpoint that retrieves the system's current resource usage.
-# It requires a current user dependency which is resolved by the get_current_user function.
+# It requires a current user with the device_read permission, resolved by require_permission.
 # The endpoint will return data conforming to the SystemResources model.
-async def get_system_resources_endpoint(current_user: str = Depends(get_current_user)):
+async def get_system_resources_endpoint(
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+):
     """
     Get system resource utilization details.
 
@@ -29,20 +79,97 @@ async def get_system_resources_endpoint(current_user: str = Depends(get_current_
         SystemResources: An object containing the system's resource utilization details,
                          including CPU, memory, and disk usage percentages.
     """
+    return collect_system_resources()
 
-    # Get the current CPU usage as a percentage.
-    cpu_usage_percent = psutil.cpu_percent()
 
-    # Get the current memory usage as a percentage.
-    memory_usage_percent = psutil.virtual_memory().percent
+@router.get(
+    "/system-resources/stream",
+    summary="Stream system resources",
+    response_class=StreamingResponse,
+)
+async def stream_system_resources(
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+):
+    """
+    Stream system resource utilization as Server-Sent Events.
 
-    # Get the current disk usage as a percentage.
-    # This specifically checks the root partition '/'.
-    disk_usage_percent = psutil.disk_usage("/").percent
+    A single background sampler measures CPU, memory and disk usage every `RESOURCE_SAMPLE_INTERVAL`
+    seconds and every connected client receives the same `resources` event, so the sampling cost does
+    not grow with the number of dashboards. Slow clients skip intermediate samples.
 
-    # Return the gathered resource information packaged in a SystemResources response model.
-    return SystemResources(
-        cpu_usage_percent=cpu_usage_percent,
-        memory_usage_percent=memory_usage_percent,
-        disk_usage_percent=disk_usage_percent,
-    )
+    Args:
+        current_user (str): The username of the authenticated user, obtained from the token dependency.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response whose events carry the `SystemResources` fields
+                           and a `timestamp`.
+    """
+
+    async def event_stream():
+        resource_sampler.ensure_running()
+        async for payload in resource_sampler.events.subscribe(
+            heartbeat=STREAM_HEARTBEAT
+        ):
+            yield sse_event(payload, event="resources")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.get(
+    "/system-resources/history",
+    response_model=ResourceHistory,
+    summary="Get system resource history",
+)
+async def get_system_resources_history(
+    seconds: float = Query(
+        300, gt=0, description="Length of the window, ending now, in seconds."
+    ),
+    buckets: int = Query(
+        60, ge=1, le=1000, description="Number of buckets to split the window into."
+    ),
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+):
+    """
+    Get downsampled system resource history.
+
+    The background sampler records CPU, memory and disk usage every `RESOURCE_SAMPLE_INTERVAL` seconds into
+    an in-memory ring buffer. This endpoint splits the requested window into equal time buckets and returns
+    the minimum, maximum and average of each metric per bucket, without taking new measurements.
+
+    Args:
+        seconds (float): Length of the window, ending now, in seconds.
+        buckets (int): Number of buckets to split the window into. Empty buckets are omitted.
+        current_user (str): The username of the authenticated user, obtained from the token dependency.
+
+    Returns:
+        ResourceHistory: The sampling interval and the non-empty buckets, oldest first.
+    """
+    return {
+        "interval": resource_sampler.interval,
+        "buckets": resource_sampler.history.window(seconds, buckets),
+    }
+
+
+@router.get(
+    "/system-resources/extended",
+    response_model=ExtendedSystemResources,
+    summary="Get detailed system resources",
+)
+async def get_extended_system_resources(
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+):
+    """
+    Get a detailed breakdown of system resource utilization.
+
+    Returns per-core CPU utilization, load average, swap usage, usage of every mounted partition and
+    disk/network I/O rates. CPU utilization and rates are measured since the previous collection, which
+    is reused for `RESOURCE_SAMPLE_INTERVAL` seconds so that concurrent callers share one measurement.
+
+    Args:
+        current_user (str): The username of the authenticated user, obtained from the token dependency.
+
+    Returns:
+        ExtendedSystemResources: The detailed resource utilization.
+    """
+    # Collection blocks on a lock and a statvfs per mount, keep it off the event loop.
+    return await run_in_threadpool(extended_resources.collect)
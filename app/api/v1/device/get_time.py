@@ -1,19 +1,32 @@
-import subprocess
-from datetime import datetime
+import os
+import time
+from datetime import datetime, tzinfo
+from typing import Optional
 
 import pytz
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
-from app.dependencies.token_dependency import get_current_user
+from app.core.config import TIMEZONE_RECHECK_INTERVAL
+from app.core.permissions import DEVICE_READ
+from app.dependencies.token_dependency import require_permission
 from app.schemas.info import TimeDetails
+from app.utils.commands import run_command
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.logger import configure_logger
+from app.utils.shared_state import shared_generations
+
+# Setup logging
+logger = configure_logger()
 
 router = APIRouter()
 
+LOCALTIME_PATH = "/etc/localtime"
+
 
-def get_system_timezone() -> str:
+async def get_system_timezone() -> str:
     try:
         # Get the current timezone from the system settings
-        result = subprocess.run(["timedatectl", "show", "-p", "Timezone", "--value"], capture_output=True, text=True)
+        result = await run_command(["timedatectl", "show", "-p", "Timezone", "--value"])
         if result.returncode == 0:
             return result.stdout.strip()
         else:
@@ -23,17 +36,108 @@ def get_system_timezone() -> str:
         return "Unknown"
 
 
-def get_system_time_details() -> dict:
+def get_timezone_from_localtime(path: str = LOCALTIME_PATH) -> Optional[str]:
+    """
+    Read the timezone name from the `/etc/localtime` symlink without spawning a process.
+
+    Args:
+        path (str): The localtime path, normally a symlink into the zoneinfo database.
+
+    Returns:
+        str: The timezone name, e.g. 'Asia/Tehran', or None if it cannot be determined.
+    """
+    try:
+        target = os.readlink(path)
+    except OSError:
+        return None
+    _, marker, name = target.rpartition("zoneinfo/")
+    return name if marker and name else None
+
+
+class TimezoneCache:
+    """
+    Keeps the resolved system timezone in memory.
+
+    The cached value is refreshed only when `/etc/localtime` is replaced or modified, which is checked at most
+    once every `recheck_interval` seconds, or when `invalidate` is called after the timezone was changed in
+    this or any other worker process.
+    """
+
+    def __init__(
+        self,
+        path: str = LOCALTIME_PATH,
+        recheck_interval: float = TIMEZONE_RECHECK_INTERVAL,
+    ):
+        self.path = path
+        self.recheck_interval = recheck_interval
+        self._timezone: Optional[tzinfo] = None
+        self._stamp: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._generation = shared_generations.get("timezone")
+
+    def _localtime_stamp(self) -> Optional[tuple]:
+        try:
+            st = os.lstat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    async def _resolve(self) -> tzinfo:
+        name = get_timezone_from_localtime(self.path) or await get_system_timezone()
+        try:
+            return pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            logger.warning(f"Unknown system timezone '{name}', falling back to UTC")
+            return pytz.utc
+
+    async def get(self) -> tzinfo:
+        """
+        Return the current system timezone, resolving it again only if it may have changed.
+
+        Returns:
+            tzinfo: The pytz timezone object for the system timezone.
+        """
+        generation = shared_generations.get("timezone")
+        if generation != self._generation:
+            self._generation = generation
+            self._timezone = None
+
+        now = time.monotonic()
+        if (
+            self._timezone is not None
+            and now - self._checked_at < self.recheck_interval
+        ):
+            return self._timezone
+
+        self._checked_at = now
+        stamp = self._localtime_stamp()
+        if self._timezone is None or stamp != self._stamp:
+            self._timezone = await self._resolve()
+            self._stamp = stamp
+        return self._timezone
+
+    def invalidate(self) -> None:
+        """Drop the cached timezone in every worker so the next read resolves it again."""
+        self._timezone = None
+        shared_generations.bump("timezone")
+
+
+timezone_cache = TimezoneCache()
+
+
+async def get_system_time_details(now: Optional[datetime] = None) -> dict:
     """
     Get the current system time details including time, date, and timezone.
 
+    Parameters:
+        now (datetime, optional): The aware time to report. Defaults to the current time.
+
     Returns:
         dict: A dictionary containing the system's current time details.
     """
-    system_tz_name = get_system_timezone()
-    local_tz = pytz.timezone(system_tz_name)
+    local_tz = await timezone_cache.get()
 
-    current_time = datetime.now(local_tz)
+    current_time = (now or datetime.now(local_tz)).astimezone(local_tz)
     time_str = current_time.strftime("%H:%M:%S")
     date_str = current_time.strftime("%Y-%m-%d")
     offset_str = f"{current_time.utcoffset().total_seconds() / 3600:+05.2f}".replace(".", ":")
@@ -47,11 +151,20 @@ def get_system_time_details() -> dict:
     response_model=TimeDetails,
     summary="Get system datatime and timezone",
 )
-async def system_time_info(current_user: str = Depends(get_current_user)) -> TimeDetails:
+async def system_time_info(
+    request: Request,
+    response: Response,
+    current_user: str = Depends(require_permission(DEVICE_READ)),
+) -> TimeDetails:
     """
     Endpoint to fetch the system's current time details.
 
+    The response is reported to the second, so its `ETag` is derived from the current second and the
+    timezone; a repeated poll within the same second is answered with 304.
+
     Parameters:
+        request (Request): The incoming request.
+        response (Response): The outgoing response, used to set the caching headers.
         current_user (str): The authenticated user's name/ID.
 
     Returns:
@@ -60,4 +173,11 @@ async def system_time_info(current_user: str = Depends(get_current_user)) -> Tim
     Raises:
         HTTPException: If the user is not authenticated.
     """
-    return get_system_time_details()
+    local_tz = await timezone_cache.get()
+    # The tag and the body report the same second, read once.
+    now = datetime.now(local_tz)
+    etag = make_etag(now.strftime("%Y-%m-%d %H:%M:%S"), local_tz.zone)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return await get_system_time_details(now)
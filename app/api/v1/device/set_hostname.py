@@ -1,16 +1,18 @@
-import subprocess
-
 from fastapi import APIRouter, HTTPException, Depends
 
-from app.dependencies.token_dependency import get_current_user
+from app.core.permissions import DEVICE_WRITE
+from app.dependencies.token_dependency import require_permission
 from app.schemas.hostname import Hostname
+from app.utils.commands import run_command
+from app.utils.shared_state import shared_generations
 
 router = APIRouter()
 
 
-def update_hostname(hostname: str) -> bool:
+async def update_hostname(hostname: str) -> bool:
     try:
-        subprocess.run(["hostnamectl", "set-hostname", hostname], check=True)
+        await run_command(["hostnamectl", "set-hostname", hostname], check=True)
+        shared_generations.bump("hostname")
         return True
     except Exception as e:
         print(f"Error setting hostname: {e}")
@@ -19,7 +21,8 @@ def update_hostname(hostname: str) -> bool:
 
 @router.post("/set_hostname/", summary="Configure hostname")
 async def set_hostname_endpoint(
-    hostname_data: Hostname, current_user: str = Depends(get_current_user)
+    hostname_data: Hostname,
+    current_user: str = Depends(require_permission(DEVICE_WRITE)),
 ):
     """
     Update the system's hostname.
@@ -38,7 +41,7 @@ async def set_hostname_endpoint(
         :param hostname_data:
         :param current_user:
     """
-    result = update_hostname(hostname_data.hostname)
+    result = await update_hostname(hostname_data.hostname)
     if result:
         return {"status": "Hostname updated successfully!"}
     else:
@@ -1,51 +1,16 @@
-import subprocess
-from typing import List
+from ipaddress import IPv4Interface
 
 from fastapi import APIRouter, Depends, HTTPException
 
-from app.core.config import SCRIPTS_PATH
-from app.dependencies.token_dependency import get_current_user
+from app.collectors.interfaces import interface_snapshot
+from app.core.permissions import NETWORK_WRITE
+from app.dependencies.token_dependency import require_permission
+from app.network.backends import NetworkBackendError, get_network_backend
 from app.schemas.ip_settings import NetworkConfig
 
 router = APIRouter()
 
 
-def configure_network(
-    interface_name: str, ip_address: str, subnet_mask: str, dns_servers: List[str]
-):
-    # This function will use the `ip` command to set the IP address and subnet mask
-    try:
-        # Bring the interface down
-        subprocess.run(
-            ["sudo", "ip", "link", "set", interface_name, "down"], check=True
-        )
-        # Set the new IP address
-        subprocess.run(
-            [
-                "sudo",
-                "ip",
-                "addr",
-                "add",
-                f"{ip_address}/{subnet_mask}",
-                "dev",
-                interface_name,
-            ],
-            check=True,
-        )
-        # Bring the interface up
-        subprocess.run(["sudo", "ip", "link", "set", interface_name, "up"], check=True)
-
-        # Clear existing DNS servers and set new ones
-        resolv_conf = "\n".join([f"nameserver {dns}" for dns in dns_servers])
-        with open("/etc/resolv.conf", "w") as file:
-            file.write(resolv_conf)
-
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"An error occurred: {e}")
-        return False
-
-
 @router.post(
     "/network/{interface_name}/configure",
     summary="Configure Network Interface Settings",
@@ -53,7 +18,7 @@ def configure_network(
 async def configure_ip_address(
     interface_name: str,
     config: NetworkConfig,
-    current_user: str = Depends(get_current_user),
+    current_user: str = Depends(require_permission(NETWORK_WRITE)),
 ):
     """
     Configure a network interface with either DHCP or a manual static IP configuration.
@@ -73,9 +38,13 @@ async def configure_ip_address(
       This includes the configuration mode, and depending on the mode, the necessary
       IP settings.
 
+    The configuration is applied by the backend selected with `NETWORK_BACKEND`: the network script run with
+    sudo, or rtnetlink directly from the API process. DHCP, and static configurations with DNS servers,
+    always go through the script.
+
     Returns a JSON response indicating the success or failure of the network configuration operation.
 
-    Requires an authorized user context, provided by the `get_current_user` dependency.
+    Requires an authorized user context, provided by the `require_permission(NETWORK_WRITE)` dependency.
 
     Raises an HTTPException with status code 500 if the configuration fails.
     """
@@ -84,37 +53,34 @@ async def configure_ip_address(
     if config.mode not in ["dhcp", "static"]:
         raise HTTPException(status_code=400, detail="Invalid mode specified.")
 
-    # Build the command
-    command = ["sudo", SCRIPTS_PATH, interface_name, config.mode]
-
     if config.mode == "static":
         if not config.ip_address or not config.subnet_prefix or not config.gateway:
             raise HTTPException(
                 status_code=400,
                 detail="IP address, subnet mask, and gateway are required for manual mode.",
             )
-        command.extend(
-            [
-                str(config.ip_address),
-                str(config.subnet_prefix),
-                str(config.gateway),
-                " ".join([str(dns) for dns in config.dns_servers])
-                if config.dns_servers
-                else "",
-            ]
-        )
 
-    # Execute the command
-    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-    # Check the result
-    if result.returncode == 0:
-        return {
-            "status": f"Network configuration {'automatically' if config.mode == 'dhcp' else 'manually'} updated for "
-            f"interface: {interface_name}"
-        }
-    else:
+    # Apply the configuration through the configured backend (NETWORK_BACKEND)
+    backend = get_network_backend()
+    try:
+        if config.mode == "static":
+            await backend.configure_static(
+                interface_name,
+                IPv4Interface(f"{config.ip_address}/{config.subnet_prefix}"),
+                config.gateway,
+                config.dns_servers or [],
+            )
+        else:
+            await backend.configure_dhcp(interface_name, config.dns_servers or [])
+    except NetworkBackendError as e:
         raise HTTPException(
-            status_code=500,
-            detail="Failed to update network configuration: " + result.stderr.decode(),
+            status_code=500, detail=f"Failed to update network configuration: {e}"
         )
+    finally:
+        # The interface table changed (or may have on failure), drop every worker's snapshot.
+        interface_snapshot.invalidate(shared=True)
+
+    return {
+        "status": f"Network configuration {'automatically' if config.mode == 'dhcp' else 'manually'} updated for "
+        f"interface: {interface_name}"
+    }
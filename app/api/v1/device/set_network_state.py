@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.permissions import NETWORK_WRITE
+from app.dependencies.token_dependency import require_permission
+from app.network.engine import NetworkApplyError, apply_network_state
+from app.network.state import NetworkStateError
+from app.schemas.network_state import NetworkState, NetworkStateResult
+
+router = APIRouter()
+
+
+@router.post(
+    "/network/configure",
+    response_model=NetworkStateResult,
+    summary="Apply the desired state of several network interfaces",
+)
+async def configure_network_state(
+    state: NetworkState,
+    current_user: str = Depends(require_permission(NETWORK_WRITE)),
+) -> NetworkStateResult:
+    """
+    Bring several network interfaces into a desired state in a single transaction.
+
+    The desired state of each interface (link up or down, MTU, the complete list of addresses and the default
+    gateway) is compared with its current configuration, and only the differences are applied, all at once
+    through a single `ip -batch` process. If any change fails, the changes already made are rolled back.
+    With `dry_run` set, the changes are returned without being applied.
+
+    Parameters:
+    - state (NetworkState): The desired state of the interfaces to configure.
+    - current_user (str): The authenticated user's name/ID.
+
+    Returns:
+        NetworkStateResult: The `ip` commands needed to reach the desired state and whether they were applied.
+
+    Raises:
+        HTTPException: 400 if an interface does not exist or the desired state is inconsistent, 500 if the
+        changes could not be applied.
+    """
+    try:
+        transaction = await apply_network_state(state)
+    except NetworkStateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NetworkApplyError as e:
+        detail = f"Failed to apply network configuration: {e}"
+        if e.failed_command:
+            detail += f" (at '{e.failed_command}')"
+        if not e.rolled_back:
+            detail += "; the previous configuration could not be fully restored"
+        raise HTTPException(status_code=500, detail=detail)
+
+    return {"changes": transaction.changes, "applied": transaction.applied}
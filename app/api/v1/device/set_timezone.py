@@ -1,17 +1,19 @@
-import subprocess
-
 from fastapi import APIRouter, HTTPException, Depends
 
-from app.dependencies.token_dependency import get_current_user
+from app.api.v1.device.get_time import timezone_cache
+from app.core.permissions import DEVICE_WRITE
+from app.dependencies.token_dependency import require_permission
 from app.schemas.timezone import Timezone
+from app.utils.commands import run_command
 
 router = APIRouter()
 
 
-def update_timezone(timezone: str) -> bool:
+async def update_timezone(timezone: str) -> bool:
     try:
         # Set the new timezone
-        subprocess.run(["timedatectl", "set-timezone", timezone], check=True)
+        await run_command(["timedatectl", "set-timezone", timezone], check=True)
+        timezone_cache.invalidate()
 
         return True
     except Exception as e:
@@ -21,7 +23,8 @@ def update_timezone(timezone: str) -> bool:
 
 @router.post("/set_timezone/", summary="Configure time zone")
 async def set_timezone_endpoint(
-    timezone_data: Timezone, current_user: str = Depends(get_current_user)
+    timezone_data: Timezone,
+    current_user: str = Depends(require_permission(DEVICE_WRITE)),
 ):
     """
     Update the system's timezone.
@@ -40,7 +43,7 @@ async def set_timezone_endpoint(
         HTTPException: If there's an error updating the timezone.
     """
     # Logic to set the timezone goes here
-    result = update_timezone(timezone_data.timezone)
+    result = await update_timezone(timezone_data.timezone)
     if result:
         return {"status": "Timezone updated successfully!"}
     else:
@@ -1,41 +1,33 @@
-import shlex
-import subprocess
-
 from fastapi import APIRouter, HTTPException, status, Depends
 
-from app.dependencies.token_dependency import get_current_user
+from app.core.config import NETWORK_COMMAND_TIMEOUT
+from app.core.permissions import NETWORK_WRITE
+from app.dependencies.token_dependency import require_permission
 from app.schemas.wifi import WiFiConfig
+from app.utils.commands import CommandError, run_command
 
 router = APIRouter()
 
 
-def set_wifi_connection(ssid: str, password: str) -> bool:
+async def set_wifi_connection(ssid: str, password: str) -> bool:
     # Using 'nmcli' to connect to a Wi-Fi network
-    command = (
-        f"nmcli dev wifi connect {shlex.quote(ssid)} password {shlex.quote(password)}"
-    )
+    command = ["nmcli", "dev", "wifi", "connect", ssid, "password", password]
 
     try:
-        # Execute the command without using shell=True for security reasons
-        subprocess.run(
-            shlex.split(command),
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        # Arguments are passed directly to the program, no shell is involved
+        await run_command(command, timeout=NETWORK_COMMAND_TIMEOUT, check=True)
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error setting Wi-Fi: {e.stderr.decode().strip()}")
+    except CommandError as e:
+        print(f"Error setting Wi-Fi: {e.stderr.strip() or e}")
         return False
 
 
 @router.post("/wifi-setup", summary="Configure wifi connection")
-async def setup_wifi(config: WiFiConfig, current_user: str = Depends(get_current_user)):
+async def setup_wifi(
+    config: WiFiConfig, current_user: str = Depends(require_permission(NETWORK_WRITE))
+):
     try:
-        # Here you would include the logic to set up the Wi-Fi connection using the provided details.
-        # This is highly platform-dependent and might require invoking system commands or using a
-        # platform-specific library.
-        success = True  # Placeholder for actual connection logic
+        success = await set_wifi_connection(config.ssid, config.password)
         if success:
             return {"message": "Wi-Fi connection successfully established."}
         else:
@@ -43,6 +35,8 @@ async def setup_wifi(config: WiFiConfig, current_user: str = Depends(get_current
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to establish Wi-Fi connection.",
             )
+    except HTTPException:
+        raise
     except Exception as e:
         # In case of an exception, return an error response
         raise HTTPException(
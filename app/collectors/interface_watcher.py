@@ -0,0 +1,159 @@
+"""
+Network Interface Watcher
+
+Subscribes to rtnetlink link and address notifications (RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR)
+and refreshes the shared interface snapshot only when the kernel reports a change. While the watcher runs,
+interface reads are served from memory without any TTL-driven polling, and every change is published to
+streaming subscribers.
+
+Bursts of notifications (for example a bridge with many ports going down) are coalesced into a single
+refresh after `INTERFACE_WATCH_DEBOUNCE` seconds. If the kernel drops notifications because the socket
+buffer overflowed, the snapshot is refreshed anyway so that no change is missed. Any other socket error stops
+the watcher and interface reads fall back to TTL-based snapshots.
+"""
+
+import asyncio
+import errno
+import socket
+from typing import Optional
+
+from app.collectors.interfaces import InterfaceSnapshot, interface_snapshot
+from app.core.config import INTERFACE_WATCH_DEBOUNCE
+from app.utils import netlink
+from app.utils.broadcast import Broadcaster
+from app.utils.logger import configure_logger
+
+logger = configure_logger()
+
+WATCHED_GROUPS = (
+    netlink.RTMGRP_LINK | netlink.RTMGRP_IPV4_IFADDR | netlink.RTMGRP_IPV6_IFADDR
+)
+WATCHED_MESSAGES = netlink.LINK_MESSAGES | netlink.ADDRESS_MESSAGES
+
+
+class InterfaceWatcher:
+    """
+    Keeps an `InterfaceSnapshot` current from rtnetlink notifications.
+
+    Attributes:
+        snapshot: The interface snapshot kept up to date.
+        debounce: Seconds to wait for further notifications before refreshing.
+        events: Broadcaster receiving the serialized interface table after every change.
+    """
+
+    def __init__(
+        self,
+        snapshot: InterfaceSnapshot,
+        debounce: float = INTERFACE_WATCH_DEBOUNCE,
+    ):
+        self.snapshot = snapshot
+        self.debounce = debounce
+        self.events = Broadcaster()
+        self._sock: Optional[socket.socket] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._published_version = -1
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> bool:
+        """
+        Subscribe to netlink notifications and start the refresh task.
+
+        Returns:
+            bool: True if the watcher is running, False if netlink is unavailable and TTL polling remains in use.
+        """
+        if self.running:
+            return True
+        try:
+            sock = netlink.open_route_socket(WATCHED_GROUPS)
+        except OSError as e:
+            logger.warning(f"Interface watcher disabled, netlink unavailable: {e}")
+            return False
+
+        sock.setblocking(False)
+        self._sock = sock
+        self._changed = asyncio.Event()
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
+
+        self.snapshot.watched = True
+        self.snapshot.refresh()
+        self._publish()
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self) -> None:
+        """Unsubscribe from netlink and fall back to TTL-based snapshots."""
+        self.snapshot.watched = False
+        if self._sock is not None:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_readable(self) -> None:
+        changed = False
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    self._fail(e)
+                    return
+                # Notifications were dropped; resynchronise from scratch.
+                changed = True
+                continue
+            for message in netlink.parse_messages(data):
+                if message.type in WATCHED_MESSAGES:
+                    changed = True
+        if changed:
+            self.snapshot.invalidate()
+            self._changed.set()
+
+    def _fail(self, error: OSError) -> None:
+        # Called from the reader callback, so the socket is released here and the task cancelled without
+        # waiting; a later `stop` finds nothing left to do.
+        logger.error(
+            f"Interface watcher stopped, falling back to TTL polling: netlink socket error: {error}"
+        )
+        self.snapshot.watched = False
+        self.snapshot.invalidate()
+        asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._changed.wait()
+            await asyncio.sleep(self.debounce)
+            self._changed.clear()
+
+            try:
+                await loop.run_in_executor(None, self.snapshot.refresh)
+            except Exception as e:
+                logger.error(f"Interface snapshot refresh failed: {e}")
+                continue
+            # A request may already have refreshed the snapshot during the debounce window,
+            # so compare against what subscribers last received rather than the previous version.
+            if self.snapshot.version != self._published_version:
+                self._publish()
+
+    def _publish(self) -> None:
+        self._published_version = self.snapshot.version
+        self.events.publish(self.snapshot.body()[1].decode())
+
+
+interface_watcher = InterfaceWatcher(interface_snapshot)
@@ -0,0 +1,205 @@
+"""
+Network Interface Snapshot
+
+This module collects the state of every network interface with a single `psutil.net_if_addrs()` and a single
+`psutil.net_if_stats()` call, and keeps the result in compact, immutable records keyed by interface name.
+The snapshot is shared by the interface endpoints and reused until it is older than `INTERFACE_SNAPSHOT_TTL`
+seconds, so the cost of a read no longer grows with the number of interfaces times the number of requests.
+
+Each refresh that changes the interface table increments `version`, which callers can use to detect changes,
+and updates `etag`, a digest of the table that is identical in every worker process holding the same data.
+`body()` returns the encoded `/device/interfaces` response with its tag, encoded once per version.
+When the netlink interface watcher is running it sets `watched`, and the snapshot is then only collected again
+after the watcher reports a change. `invalidate(shared=True)` forces every worker process to collect again, which
+is used after the API itself reconfigures an interface.
+"""
+
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import psutil
+
+from app.core.config import INTERFACE_SNAPSHOT_TTL
+from app.utils.etag import make_etag
+from app.utils.metrics import collector_duration
+from app.utils.serialization import json_dumps
+from app.utils.shared_state import shared_generations
+
+
+class AddressRecord(NamedTuple):
+    """A single address assigned to an interface, as reported by psutil."""
+
+    family: Any
+    address: str
+    netmask: Optional[str]
+    broadcast: Optional[str]
+    ptp: Optional[str]
+
+    def as_dict(self) -> dict:
+        return {
+            "family": str(self.family),
+            "address": self.address,
+            "netmask": self.netmask,
+            "broadcast": self.broadcast,
+            "ptp": self.ptp,
+        }
+
+
+class InterfaceRecord(NamedTuple):
+    """Addresses and link statistics of one network interface."""
+
+    name: str
+    addresses: Tuple[AddressRecord, ...]
+    speed: int
+    duplex: Any
+    mtu: int
+    isup: bool
+
+    def as_dict(self) -> dict:
+        return {
+            "addresses": [address.as_dict() for address in self.addresses],
+            "stats": {
+                "speed": self.speed,
+                "duplex": str(self.duplex),
+                "mtu": self.mtu,
+                "isup": self.isup,
+            },
+        }
+
+
+def collect_interfaces() -> Dict[str, InterfaceRecord]:
+    """
+    Take one snapshot of all network interfaces.
+
+    Interfaces that disappear between the address and statistics queries are skipped.
+
+    Returns:
+        dict: Interface records keyed by interface name.
+    """
+    all_addrs = psutil.net_if_addrs()
+    all_stats = psutil.net_if_stats()
+
+    records = {}
+    for name, addrs in all_addrs.items():
+        stats = all_stats.get(name)
+        if stats is None:
+            continue
+        records[name] = InterfaceRecord(
+            name=name,
+            addresses=tuple(AddressRecord(*addr) for addr in addrs),
+            speed=stats.speed,
+            duplex=stats.duplex,
+            mtu=stats.mtu,
+            isup=stats.isup,
+        )
+    return records
+
+
+class InterfaceSnapshot:
+    """
+    Time-bounded cache of the interface table.
+
+    Attributes:
+        ttl: Seconds a snapshot is served before it is collected again.
+        version: Counter incremented every time a refresh changes the interface table.
+        etag: Entity tag of the current interface table.
+        watched: True while an external watcher invalidates the snapshot on change, disabling the TTL.
+    """
+
+    def __init__(self, ttl: float = INTERFACE_SNAPSHOT_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self.watched = False
+        self._records: Dict[str, InterfaceRecord] = {}
+        self.etag = make_etag(self._records)
+        # (records, etag, encoded response body) of the last table encoded by body().
+        self._body: Optional[Tuple[Dict[str, InterfaceRecord], str, bytes]] = None
+        self._taken_at = float("-inf")
+        self._lock = threading.Lock()
+        self._generation = shared_generations.get("interfaces")
+
+    def is_stale(self) -> bool:
+        if shared_generations.get("interfaces") != self._generation:
+            return True
+        if self.watched:
+            return self._taken_at == float("-inf")
+        return time.monotonic() - self._taken_at >= self.ttl
+
+    def refresh(self) -> Dict[str, InterfaceRecord]:
+        """
+        Collect the interface table now, regardless of its age.
+
+        Returns:
+            dict: Interface records keyed by interface name.
+        """
+        with self._lock:
+            self._generation = shared_generations.get("interfaces")
+            with collector_duration.time("interfaces"):
+                records = collect_interfaces()
+            if records != self._records:
+                self._records = records
+                self.etag = make_etag(records)
+                self.version += 1
+            self._taken_at = time.monotonic()
+            return self._records
+
+    def get(self) -> Dict[str, InterfaceRecord]:
+        """
+        Return the interface table, collecting it again only if the snapshot is stale.
+
+        Returns:
+            dict: Interface records keyed by interface name.
+        """
+        if self.is_stale():
+            return self.refresh()
+        return self._records
+
+    def body(self) -> Tuple[str, bytes]:
+        """
+        Return the interface table encoded as an `InterfacesResponse` JSON document.
+
+        The table is encoded again only after a refresh has changed it. The tag is derived from the same
+        table as the body, even if a refresh on another thread replaces the table in the meantime.
+
+        Returns:
+            tuple: The entity tag and the encoded response body.
+        """
+        records = self.get()
+        cached = self._body
+        if cached is None or cached[0] is not records:
+            encoded = json_dumps(
+                {
+                    "interfaces": {
+                        name: record.as_dict() for name, record in records.items()
+                    }
+                }
+            )
+            cached = self._body = (records, make_etag(records), encoded)
+        return cached[1], cached[2]
+
+    def get_interface(self, name: str) -> Optional[InterfaceRecord]:
+        """
+        Return the record of a single interface.
+
+        Args:
+            name (str): The interface name.
+
+        Returns:
+            InterfaceRecord: The record, or None if the interface does not exist.
+        """
+        return self.get().get(name)
+
+    def invalidate(self, shared: bool = False) -> None:
+        """
+        Force the next read to collect a fresh snapshot.
+
+        Args:
+            shared (bool): Also invalidate the snapshots of all other worker processes.
+        """
+        self._taken_at = float("-inf")
+        if shared:
+            shared_generations.bump("interfaces")
+
+
+interface_snapshot = InterfaceSnapshot()
@@ -0,0 +1,424 @@
+"""
+System Resource Sampler
+
+Samples CPU, memory and root-partition disk usage on a fixed cadence in a single background task and publishes
+every sample to streaming subscribers. However many clients are connected, psutil is queried once per interval.
+
+CPU utilisation is computed from the sampler's own `psutil.cpu_times()` deltas rather than
+`psutil.cpu_percent()`, whose module-level state is shared with every other caller in the process and would
+otherwise skew the measured interval.
+
+When history is enabled the sampler runs for the lifetime of the application and records every sample into
+a fixed-size, array-backed ring buffer from which downsampled windows can be served without touching psutil.
+
+`ExtendedResourceCollector` provides the detailed breakdown (per-core CPU, load, swap, mounts and I/O rates)
+computed from counter deltas held in preallocated arrays.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from array import array
+from typing import List, Optional, Tuple
+
+import psutil
+
+from app.core.config import RESOURCE_HISTORY_SIZE, RESOURCE_SAMPLE_INTERVAL
+from app.utils.broadcast import Broadcaster
+from app.utils.logger import configure_logger
+from app.utils.metrics import collector_duration
+
+logger = configure_logger()
+
+
+def cpu_times_total_busy(times) -> Tuple[float, float]:
+    """
+    Split a `psutil.cpu_times()` reading into total and busy time.
+
+    On Linux the guest and guest_nice times are already counted in user and nice, so they are left out of the
+    total, as `psutil.cpu_percent()` does.
+
+    Args:
+        times: The reading, for all CPUs or a single one.
+
+    Returns:
+        tuple: The total and the busy time in seconds.
+    """
+    total = (
+        sum(times) - getattr(times, "guest", 0.0) - getattr(times, "guest_nice", 0.0)
+    )
+    busy = total - times.idle - getattr(times, "iowait", 0.0)
+    return total, busy
+
+
+def cpu_busy_percent(previous, current) -> float:
+    """
+    Compute CPU utilisation between two `psutil.cpu_times()` readings.
+
+    Args:
+        previous: The earlier reading.
+        current: The later reading.
+
+    Returns:
+        float: The busy percentage in the range 0-100.
+    """
+    previous_total, previous_busy = cpu_times_total_busy(previous)
+    total, busy = cpu_times_total_busy(current)
+    if total - previous_total <= 0:
+        return 0.0
+    percent = (busy - previous_busy) / (total - previous_total) * 100.0
+    return round(min(max(percent, 0.0), 100.0), 1)
+
+
+class ResourceHistory:
+    """
+    Fixed-capacity ring buffer of resource samples.
+
+    Each field is stored in its own preallocated `array('d')`, so memory use is constant (8 bytes per value)
+    and appending never allocates.
+
+    Attributes:
+        capacity: The number of samples retained; older samples are overwritten.
+    """
+
+    FIELDS = ("cpu_usage_percent", "memory_usage_percent", "disk_usage_percent")
+
+    def __init__(self, capacity: int = RESOURCE_HISTORY_SIZE):
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = {field: array("d", bytes(8 * capacity)) for field in self.FIELDS}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, sample: dict) -> None:
+        """
+        Record a sample, overwriting the oldest one when the buffer is full.
+
+        Args:
+            sample (dict): A sample with a `timestamp` and the `FIELDS` values.
+        """
+        i = self._next
+        self._timestamps[i] = sample["timestamp"]
+        for field, values in self._values.items():
+            values[i] = sample[field]
+        self._next = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _indices(self):
+        start = (self._next - self._count) % self.capacity
+        return ((start + n) % self.capacity for n in range(self._count))
+
+    def window(self, seconds: float, buckets: int) -> List[dict]:
+        """
+        Downsample the last `seconds` of history into at most `buckets` equal-width time buckets.
+
+        Args:
+            seconds (float): The length of the window ending now.
+            buckets (int): The number of buckets to split the window into.
+
+        Returns:
+            list: One dictionary per non-empty bucket, oldest first, with `start`, `end`, `samples` and a
+                  `min`/`max`/`avg` summary for every field.
+        """
+        end = time.time()
+        start = end - seconds
+        width = seconds / buckets
+        acc = {}
+        for i in self._indices():
+            ts = self._timestamps[i]
+            if ts < start:
+                continue
+            b = min(int((ts - start) / width), buckets - 1)
+            bucket = acc.get(b)
+            if bucket is None:
+                bucket = acc[b] = {
+                    "samples": 0,
+                    **{
+                        field: [float("inf"), float("-inf"), 0.0]
+                        for field in self.FIELDS
+                    },
+                }
+            bucket["samples"] += 1
+            for field, values in self._values.items():
+                value = values[i]
+                stats = bucket[field]
+                stats[0] = min(stats[0], value)
+                stats[1] = max(stats[1], value)
+                stats[2] += value
+
+        result = []
+        for b in sorted(acc):
+            bucket = acc[b]
+            n = bucket["samples"]
+            entry = {
+                "start": start + b * width,
+                "end": start + (b + 1) * width,
+                "samples": n,
+            }
+            for field in self.FIELDS:
+                lo, hi, total = bucket[field]
+                entry[field] = {"min": lo, "max": hi, "avg": round(total / n, 2)}
+            result.append(entry)
+        return result
+
+
+class ResourceSampler:
+    """
+    Periodically samples system resource usage and broadcasts it.
+
+    The sampling task starts when the first subscriber arrives and stops once nobody is listening, unless it
+    was started with `start()`, in which case it keeps running and records every sample into `history`.
+
+    Attributes:
+        interval: Seconds between samples.
+        events: Broadcaster receiving each sample serialized as JSON.
+        history: Ring buffer of past samples.
+        latest: The most recent sample, or None before the first one.
+    """
+
+    def __init__(
+        self,
+        interval: float = RESOURCE_SAMPLE_INTERVAL,
+        history_size: int = RESOURCE_HISTORY_SIZE,
+    ):
+        self.interval = interval
+        self.events = Broadcaster()
+        self.history = ResourceHistory(history_size)
+        self.latest: Optional[dict] = None
+        self._persistent = False
+        self._cpu_times = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def sample(self) -> dict:
+        """
+        Take one sample of CPU, memory and disk usage.
+
+        Returns:
+            dict: A dictionary with the `SystemResources` fields and a `timestamp`.
+        """
+        with collector_duration.time("resource_sample"):
+            cpu_times = psutil.cpu_times()
+            previous, self._cpu_times = self._cpu_times, cpu_times
+            return {
+                "timestamp": time.time(),
+                "cpu_usage_percent": (
+                    cpu_busy_percent(previous, cpu_times) if previous else 0.0
+                ),
+                "memory_usage_percent": psutil.virtual_memory().percent,
+                "disk_usage_percent": psutil.disk_usage("/").percent,
+            }
+
+    def ensure_running(self) -> None:
+        """Start the sampling task if it is not running yet."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def start(self) -> None:
+        """Start sampling continuously, independent of streaming subscribers."""
+        self._persistent = True
+        self.ensure_running()
+
+    def fresh_sample(self) -> Optional[dict]:
+        """
+        Return the latest sample if it is no older than two sampling intervals.
+
+        Returns:
+            dict: The latest sample, or None if the sampler is not running or the sample is stale.
+        """
+        sample = self.latest
+        if (
+            self.running
+            and sample is not None
+            and time.time() - sample["timestamp"] <= 2 * self.interval
+        ):
+            return sample
+        return None
+
+    async def stop(self) -> None:
+        """Stop the sampling task."""
+        self._persistent = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def should_continue(self) -> bool:
+        return self._persistent or self.events.subscriber_count > 0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Establish the CPU baseline so the first published sample covers a full interval.
+        await loop.run_in_executor(None, self.sample)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                sample = await loop.run_in_executor(None, self.sample)
+            except Exception as e:
+                logger.error(f"Resource sampling failed: {e}")
+                continue
+            self.latest = sample
+            self.history.append(sample)
+            self.events.publish(json.dumps(sample))
+            if not self.should_continue():
+                break
+
+
+resource_sampler = ResourceSampler()
+
+
+class ExtendedResourceCollector:
+    """
+    Collects a detailed resource breakdown: per-core CPU, load average, swap, per-mount disk usage and
+    disk/network I/O rates.
+
+    Cumulative counters (per-core CPU times, disk and network I/O) are kept in preallocated `array('d')`
+    buffers and rates are computed from the delta against the previous collection, so a call allocates no
+    per-counter Python objects beyond psutil's own results. Calls made within `min_interval` seconds of the
+    previous collection reuse its result, which keeps the cost flat no matter how many clients poll.
+
+    Attributes:
+        min_interval: Minimum seconds between two collections.
+    """
+
+    IO_FIELDS = (
+        "read_bytes",
+        "write_bytes",
+        "read_count",
+        "write_count",
+        "bytes_sent",
+        "bytes_recv",
+        "packets_sent",
+        "packets_recv",
+    )
+    PARTITIONS_TTL = 30.0
+
+    def __init__(self, min_interval: float = RESOURCE_SAMPLE_INTERVAL):
+        self.min_interval = min_interval
+        self.cpu_count = psutil.cpu_count() or 1
+        self._cpu_busy = array("d", bytes(8 * self.cpu_count))
+        self._cpu_total = array("d", bytes(8 * self.cpu_count))
+        self._io = array("d", bytes(8 * len(self.IO_FIELDS)))
+        self._io_rates = array("d", bytes(8 * len(self.IO_FIELDS)))
+        self._collected_at: Optional[float] = None
+        self._partitions: List = []
+        self._partitions_at = float("-inf")
+        self._result: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def _mounted_partitions(self, now: float) -> List:
+        if now - self._partitions_at >= self.PARTITIONS_TTL:
+            self._partitions = psutil.disk_partitions(all=False)
+            self._partitions_at = now
+        return self._partitions
+
+    def _per_cpu_percent(self) -> List[float]:
+        percents = []
+        for i, times in enumerate(psutil.cpu_times(percpu=True)[: self.cpu_count]):
+            total, busy = cpu_times_total_busy(times)
+            delta_total = total - self._cpu_total[i]
+            delta_busy = busy - self._cpu_busy[i]
+            self._cpu_total[i] = total
+            self._cpu_busy[i] = busy
+            percent = delta_busy / delta_total * 100.0 if delta_total > 0 else 0.0
+            percents.append(round(min(max(percent, 0.0), 100.0), 1))
+        return percents
+
+    def _io_counters(self, now: float) -> array:
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        elapsed = now - self._collected_at if self._collected_at is not None else 0.0
+        for i, field in enumerate(self.IO_FIELDS):
+            source = disk if i < 4 else net
+            value = float(getattr(source, field, 0)) if source is not None else 0.0
+            delta = value - self._io[i]
+            self._io_rates[i] = delta / elapsed if elapsed > 0 and delta >= 0 else 0.0
+            self._io[i] = value
+        return self._io_rates
+
+    def collect(self) -> dict:
+        """
+        Return the extended resource breakdown, collecting it again if the previous one is too old.
+
+        Returns:
+            dict: A dictionary matching the `ExtendedSystemResources` schema.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._result is not None
+                and now - self._collected_at < self.min_interval
+            ):
+                return self._result
+
+            started = time.perf_counter()
+            elapsed = (
+                now - self._collected_at if self._collected_at is not None else 0.0
+            )
+            per_cpu = self._per_cpu_percent()
+            rates = self._io_counters(now)
+            self._collected_at = now
+
+            load1, load5, load15 = os.getloadavg()
+            swap = psutil.swap_memory()
+            disks = []
+            for partition in self._mounted_partitions(now):
+                try:
+                    usage = psutil.disk_usage(partition.mountpoint)
+                except OSError:
+                    continue
+                disks.append(
+                    {
+                        "device": partition.device,
+                        "mountpoint": partition.mountpoint,
+                        "fstype": partition.fstype,
+                        "total": usage.total,
+                        "used": usage.used,
+                        "free": usage.free,
+                        "percent": usage.percent,
+                    }
+                )
+
+            self._result = {
+                "interval": round(elapsed, 3),
+                "cpu_usage_percent": round(sum(per_cpu) / len(per_cpu), 1),
+                "per_cpu_percent": per_cpu,
+                "load_average": {"one": load1, "five": load5, "fifteen": load15},
+                "memory_usage_percent": psutil.virtual_memory().percent,
+                "swap": {
+                    "total": swap.total,
+                    "used": swap.used,
+                    "percent": swap.percent,
+                },
+                "disks": disks,
+                "disk_io": {
+                    "read_bytes_per_sec": round(rates[0], 1),
+                    "write_bytes_per_sec": round(rates[1], 1),
+                    "read_ops_per_sec": round(rates[2], 1),
+                    "write_ops_per_sec": round(rates[3], 1),
+                },
+                "network_io": {
+                    "sent_bytes_per_sec": round(rates[4], 1),
+                    "recv_bytes_per_sec": round(rates[5], 1),
+                    "sent_packets_per_sec": round(rates[6], 1),
+                    "recv_packets_per_sec": round(rates[7], 1),
+                },
+            }
+            collector_duration.observe(
+                time.perf_counter() - started, "extended_resources"
+            )
+            return self._result
+
+
+extended_resources = ExtendedResourceCollector()
@@ -10,12 +10,44 @@ UVICORN_HOST = env.str(
     "UVICORN_HOST", "0.0.0.0"
 )  # Default to '0.0.0.0' if not specified
 UVICORN_PORT = env.int("UVICORN_PORT", 8081)  # Default to 8081 if not specified
+UVICORN_WORKERS = env.int("UVICORN_WORKERS", 1)  # Number of worker processes
+UVICORN_RELOAD = env.bool("UVICORN_RELOAD", False)  # Auto-reload, for development only
+UVICORN_GRACEFUL_TIMEOUT = env.float(
+    "UVICORN_GRACEFUL_TIMEOUT", 10.0
+)  # Seconds to wait for open requests on shutdown
+
+# File holding the cache generation counters shared by all worker processes
+SHARED_STATE_PATH = env.str("SHARED_STATE_PATH", "/dev/shm/lynxapi-state")
 
 # Access token settings for authentication
 ACCESS_TOKEN_EXPIRE_MINUTES = env.int(
     "ACCESS_TOKEN_EXPIRE_MINUTES", 30
 )  # Token expiry time
 
+# Maximum number of verified token payloads kept in memory
+TOKEN_CACHE_SIZE = env.int("TOKEN_CACHE_SIZE", 1024)
+
+# Password verification pool used by the token endpoint
+AUTH_WORKERS = env.int("AUTH_WORKERS", 2)  # Threads verifying passwords concurrently
+AUTH_QUEUE_SIZE = env.int("AUTH_QUEUE_SIZE", 8)  # Logins allowed to wait before 503
+
+# Brute-force protection for the token endpoint, per client IP and per username
+LOGIN_RATE = env.float("LOGIN_RATE", 0.2)  # Sustained login attempts per second
+LOGIN_BURST = env.int("LOGIN_BURST", 5)  # Login attempts allowed at once
+LOGIN_MAX_FAILURES = env.int("LOGIN_MAX_FAILURES", 5)  # Failures before a lockout
+LOGIN_FAILURE_WINDOW = env.float(
+    "LOGIN_FAILURE_WINDOW", 300.0
+)  # Seconds in which failures are counted
+LOGIN_LOCKOUT_SECONDS = env.float("LOGIN_LOCKOUT_SECONDS", 300.0)  # Lockout duration
+
+# Requests with a missing or invalid token allowed per client IP before answering 429
+AUTH_FAILURE_RATE = env.float("AUTH_FAILURE_RATE", 1.0)  # Per second, sustained
+AUTH_FAILURE_BURST = env.int("AUTH_FAILURE_BURST", 20)  # At once
+RATE_LIMIT_MAX_KEYS = env.int("RATE_LIMIT_MAX_KEYS", 10000)  # Clients tracked
+TRUSTED_PROXIES = env.list(
+    "TRUSTED_PROXIES", []
+)  # Proxy addresses or networks whose X-Forwarded-For is trusted
+
 # Application secret key for cryptographic operations
 API_SECRET_KEY = env.str("API_SECRET_KEY")  # API secret key
 
@@ -25,8 +57,95 @@ API_ALGORITHM = env.str("API_ALGORITHM")
 # Enable or disable API documentation
 DOCS = env.bool("DOCS", False)  # Whether to generate API docs
 
+# Paths served without a bearer token; an entry ending in '*' matches every path with that prefix
+EXCLUDED_ROUTES = env.list(
+    "EXCLUDED_ROUTES",
+    ["/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json", "/api/admin/token"],
+)
+
+# Logging: size-based rotation of logs/project.log, queue bound and repeat suppression
+LOG_MAX_BYTES = env.int("LOG_MAX_BYTES", 10 * 1024 * 1024)  # Rotate at this size
+LOG_BACKUP_COUNT = env.int("LOG_BACKUP_COUNT", 5)  # Rotated files kept
+LOG_QUEUE_SIZE = env.int("LOG_QUEUE_SIZE", 10000)  # Records buffered before dropping
+LOG_REPEAT_INTERVAL = env.float(
+    "LOG_REPEAT_INTERVAL", 60.0
+)  # Seconds a repeated warning is suppressed, 0 to disable
+
+# Serve /metrics without a bearer token
+METRICS_PUBLIC = env.bool("METRICS_PUBLIC", False)
+# Directory of the per-worker metric snapshots merged by /metrics when UVICORN_WORKERS > 1
+METRICS_DIR = env.str("METRICS_DIR", "/dev/shm/lynxapi-metrics")
+METRICS_FLUSH_INTERVAL = env.float(
+    "METRICS_FLUSH_INTERVAL", 5.0
+)  # Seconds between two snapshots of a worker
+
 # Path to the scripts used by the application
 SCRIPTS_PATH = env.str("SCRIPTS_PATH")  # Path to network-config script
 
+# Backend applying interface configurations: 'script' runs SCRIPTS_PATH with sudo, 'netlink' uses rtnetlink
+# directly and needs CAP_NET_ADMIN (DHCP is still handled by the script)
+NETWORK_BACKEND = env.str("NETWORK_BACKEND", "script")
+
+# External command execution
+COMMAND_TIMEOUT = env.float(
+    "COMMAND_TIMEOUT", 30.0
+)  # Default seconds before a command is killed
+NETWORK_COMMAND_TIMEOUT = env.float(
+    "NETWORK_COMMAND_TIMEOUT", 120.0
+)  # Seconds allowed for network scripts (DHCP can be slow)
+COMMAND_CONCURRENCY = env.int(
+    "COMMAND_CONCURRENCY", 4
+)  # Commands allowed to run at once
+
+# Seconds a network interface snapshot is reused before psutil is queried again
+INTERFACE_SNAPSHOT_TTL = env.float("INTERFACE_SNAPSHOT_TTL", 1.0)
+
+# Refresh interface snapshots from rtnetlink notifications instead of polling
+INTERFACE_WATCHER = env.bool("INTERFACE_WATCHER", True)
+INTERFACE_WATCH_DEBOUNCE = env.float(
+    "INTERFACE_WATCH_DEBOUNCE", 0.1
+)  # Seconds to coalesce bursts of notifications
+
+# Seconds between system resource samples published to streaming clients
+RESOURCE_SAMPLE_INTERVAL = env.float("RESOURCE_SAMPLE_INTERVAL", 1.0)
+
+# Keep sampling in the background and retain a resource usage history
+RESOURCE_HISTORY = env.bool("RESOURCE_HISTORY", True)
+RESOURCE_HISTORY_SIZE = env.int(
+    "RESOURCE_HISTORY_SIZE", 3600
+)  # Number of samples retained
+
+# Seconds between keep-alive comments on streaming endpoints
+STREAM_HEARTBEAT = env.float("STREAM_HEARTBEAT", 15.0)
+
+# Response compression, negotiated with Accept-Encoding (brotli requires the brotli package)
+COMPRESSION_MIN_SIZE = env.int(
+    "COMPRESSION_MIN_SIZE", 1024
+)  # Bodies smaller than this many bytes are sent uncompressed
+COMPRESSION_GZIP_LEVEL = env.int(
+    "COMPRESSION_GZIP_LEVEL", 6
+)  # 1 (fastest) to 9 (smallest)
+COMPRESSION_BROTLI_QUALITY = env.int(
+    "COMPRESSION_BROTLI_QUALITY", 5
+)  # 0 (fastest) to 11 (smallest)
+COMPRESSION_CACHE_SIZE = env.int(
+    "COMPRESSION_CACHE_SIZE", 64
+)  # Compressed bodies of tagged responses kept for reuse
+
+# Seconds between checks of /etc/localtime for timezone changes
+TIMEZONE_RECHECK_INTERVAL = env.float("TIMEZONE_RECHECK_INTERVAL", 1.0)
+
 # Database configuration
 SQLALCHEMY_DATABASE_URL = env.str("SQLALCHEMY_DATABASE_URL")  # Database connection URL
+ASYNC_DATABASE_URL = env.str(
+    "ASYNC_DATABASE_URL", None
+)  # Async driver URL, derived from SQLALCHEMY_DATABASE_URL if not set
+DB_POOL_SIZE = env.int("DB_POOL_SIZE", 5)  # Connections kept open by the async engine
+DB_MAX_OVERFLOW = env.int("DB_MAX_OVERFLOW", 5)  # Extra connections under load
+DB_POOL_TIMEOUT = env.float("DB_POOL_TIMEOUT", 10.0)  # Seconds to wait for a connection
+
+# Authenticated user cache, avoids a database query per request
+USER_CACHE_SIZE = env.int("USER_CACHE_SIZE", 256)  # Maximum number of cached users
+USER_CACHE_TTL = env.float(
+    "USER_CACHE_TTL", 60.0
+)  # Seconds before a cached user is reloaded
@@ -0,0 +1,14 @@
+"""
+Permission Names
+
+The permissions checked by the API. They are stored in the `permissions` table and granted to users through
+their roles; `FULL_ACCESS` grants every permission.
+"""
+
+FULL_ACCESS = "full_access"
+DEVICE_READ = "device_read"  # Read device information, clock, interfaces and resources
+DEVICE_WRITE = "device_write"  # Change the hostname and timezone
+NETWORK_WRITE = "network_write"  # Change IP and Wi-Fi settings
+METRICS_READ = "metrics_read"  # Read /metrics
+
+ALL_PERMISSIONS = (FULL_ACCESS, DEVICE_READ, DEVICE_WRITE, NETWORK_WRITE, METRICS_READ)
@@ -0,0 +1,227 @@
+"""
+Rate Limiting
+
+In-memory limits that reject abusive clients before any password hashing, token decoding, database query
+or log write is done on their behalf.
+
+- `TokenBucketLimiter` allows short bursts and a sustained rate per key. It throttles login attempts per
+  client IP and per username, and requests that fail token authentication per client IP.
+- `FailureLockout` counts failed logins in a sliding window and locks a key out for a while once too many
+  failures accumulate, which stops slow password guessing that stays under the bucket rate.
+
+State is kept per worker process and bounded to `RATE_LIMIT_MAX_KEYS` keys, least recently used keys being
+forgotten first. A client whose requests are spread over the workers is therefore allowed up to
+`UVICORN_WORKERS` times the configured rates, bursts and failures before it is throttled or locked out.
+
+Clients are identified by `client_address`, which looks through the reverse proxies listed in
+`TRUSTED_PROXIES` so that clients behind one proxy are not all throttled together.
+"""
+
+import ipaddress
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Hashable
+
+from starlette.types import Scope
+
+from app.core.config import (
+    AUTH_FAILURE_BURST,
+    AUTH_FAILURE_RATE,
+    LOGIN_BURST,
+    LOGIN_FAILURE_WINDOW,
+    LOGIN_LOCKOUT_SECONDS,
+    LOGIN_MAX_FAILURES,
+    LOGIN_RATE,
+    RATE_LIMIT_MAX_KEYS,
+    TRUSTED_PROXIES,
+)
+
+_trusted_networks = tuple(
+    ipaddress.ip_network(proxy, strict=False) for proxy in TRUSTED_PROXIES
+)
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_networks)
+
+
+def client_address(scope: Scope) -> str:
+    """
+    Return the address of the client that sent a request.
+
+    For requests from a trusted proxy, the `X-Forwarded-For` header is read from the right and the first
+    address that is not itself a trusted proxy is returned; addresses further left are set by the client and
+    cannot be trusted.
+
+    Args:
+    - scope: The ASGI scope of the request.
+
+    Returns:
+    - str: The client address, or "unknown" if the server did not provide one.
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not _trusted_networks or not _is_trusted(address):
+        return address
+    forwarded = [
+        value.decode("latin-1")
+        for name, value in scope["headers"]
+        if name == b"x-forwarded-for"
+    ]
+    for hop in reversed(",".join(forwarded).split(",")):
+        hop = hop.strip()
+        if not hop:
+            continue
+        address = hop
+        if not _is_trusted(hop):
+            break
+    return address
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket per key: each request takes a token, tokens refill at `rate` per second up to `burst`.
+
+    Attributes:
+    - rate: Tokens added per second.
+    - burst: The bucket capacity, i.e. the number of requests allowed at once.
+    - maxsize: The maximum number of keys tracked.
+    """
+
+    def __init__(self, rate: float, burst: int, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _refill(self, key: Hashable, now: float) -> list:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now]
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+    def _wait(self, bucket: list) -> float:
+        return (1.0 - bucket[0]) / self.rate if self.rate > 0 else float("inf")
+
+    def acquire(self, key: Hashable) -> float:
+        """
+        Take a token for `key` if one is available.
+
+        Args:
+        - key: The client identifier, e.g. an IP address.
+
+        Returns:
+        - float: 0 if the request is allowed, otherwise the seconds until a token becomes available.
+        """
+        with self._lock:
+            bucket = self._refill(key, time.monotonic())
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return 0.0
+            return self._wait(bucket)
+
+
+class FailureLockout:
+    """
+    Locks a key out after `max_failures` failures within a sliding window of `window` seconds.
+
+    Attributes:
+    - max_failures: The number of failures that triggers a lockout.
+    - window: The length of the sliding window in seconds.
+    - lockout: The duration of a lockout in seconds.
+    - maxsize: The maximum number of keys tracked.
+    """
+
+    def __init__(
+        self,
+        max_failures: int,
+        window: float,
+        lockout: float,
+        maxsize: int = RATE_LIMIT_MAX_KEYS,
+    ):
+        self.max_failures = max_failures
+        self.window = window
+        self.lockout = lockout
+        self.maxsize = maxsize
+        # key -> (failure timestamps, locked until)
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def locked_for(self, key: Hashable) -> float:
+        """
+        Return the seconds left in the lockout of `key`, or 0 if it is not locked out.
+
+        Args:
+        - key: The client identifier.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return 0.0
+            return max(0.0, entry[1] - time.monotonic())
+
+    def record_failure(self, key: Hashable) -> bool:
+        """
+        Record a failure for `key`.
+
+        Args:
+        - key: The client identifier.
+
+        Returns:
+        - bool: True if this failure started a lockout.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [deque(), 0.0]
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+
+            failures = entry[0]
+            failures.append(now)
+            while failures and failures[0] <= now - self.window:
+                failures.popleft()
+            if len(failures) >= self.max_failures:
+                failures.clear()
+                entry[1] = now + self.lockout
+                return True
+            return False
+
+    def reset(self, key: Hashable) -> None:
+        """
+        Forget the failures of `key`, e.g. after a successful login.
+
+        Args:
+        - key: The client identifier.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# Login attempts, keyed by ("ip", address) and ("user", username).
+login_limiter = TokenBucketLimiter(rate=LOGIN_RATE, burst=LOGIN_BURST)
+login_lockout = FailureLockout(
+    max_failures=LOGIN_MAX_FAILURES,
+    window=LOGIN_FAILURE_WINDOW,
+    lockout=LOGIN_LOCKOUT_SECONDS,
+)
+
+# Requests rejected by the token middleware, keyed by client address.
+auth_failure_limiter = TokenBucketLimiter(
+    rate=AUTH_FAILURE_RATE, burst=AUTH_FAILURE_BURST
+)
@@ -20,10 +20,14 @@ from datetime import datetime, timedelta
 
 import jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import API_SECRET_KEY, API_ALGORITHM
+from app.core.config import API_SECRET_KEY, API_ALGORITHM, TOKEN_CACHE_SIZE
 from app.db.models import User
+from app.utils.cache import TTLCache
+from app.utils.executors import BoundedExecutor
 from app.utils.logger import configure_logger
 
 # Setup logging
@@ -32,6 +36,9 @@ logger = configure_logger()
 
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified token payloads, keyed by the raw token and expiring at the token's `exp` claim.
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=24 * 60 * 60)
+
 
 # Define the JWTError exception
 class JWTError(Exception):
@@ -44,6 +51,12 @@ def decode_token(token: str):
     """
     Decode a JWT token and return the payload.
 
+    Successfully verified payloads are cached until the token expires, so repeated requests carrying
+    the same bearer token only pay for the signature check once.
+
+    Failures are not logged here but by the caller, so that the token middleware can stay silent about
+    clients it throttles.
+
     Args:
     - token (str): The JWT token to decode.
 
@@ -53,15 +66,19 @@ def decode_token(token: str):
     Raises:
     - JWTError: If the token has expired or is invalid.
     """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, API_SECRET_KEY, algorithms=[API_ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
-        logger.error("Token has expired")
         raise JWTError("Token has expired")
-    except JWTError as e:
-        logger.error(f"Invalid token. Reason: {str(e)}")
-        raise JWTError("Invalid token")
+    except jwt.PyJWTError as e:
+        raise JWTError(f"Invalid token. Reason: {str(e)}")
+
+    token_cache.set(token, payload, expires_at=payload.get("exp"))
+    return payload
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -103,27 +120,41 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     return encoded_jwt
 
 
-def authenticate_user(db: Session, username: str, password: str) -> bool:
+async def authenticate_user(
+    db: AsyncSession, username: str, password: str, executor: BoundedExecutor
+) -> bool:
     """
     Authenticate a user against the users stored in the database.
 
+    The password hash is fetched with the async session, so the lookup does not occupy a thread. The
+    CPU-bound bcrypt verification runs in `executor`.
+
     Args:
-    - db (Session): The database session to use for queries.
+    - db (AsyncSession): The database session to use for queries.
     - username (str): The username to authenticate.
     - password (str): The associated password.
+    - executor (BoundedExecutor): The pool that runs the password verification.
 
     Returns:
     - bool: True if authentication was successful, False otherwise.
+
+    Raises:
+    - PoolFullError: If `executor` has no free slot for the verification.
     """
     try:
-        # Fetch the user from the database
-        user = db.query(User).filter(User.username == username).first()
+        # Fetch the password hash of the user from the database
+        hashed_password = await db.scalar(
+            select(User.hashed_password).where(User.username == username)
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Error during authentication: {e}")
+        return False
 
-        # If the user exists and the password is correct, return True
-        if user and verify_password(password, user.hashed_password):
-            return True
+    if hashed_password is None:
         return False
-    except Exception as e:
+    try:
+        return await executor.run(verify_password, password, hashed_password)
+    except ValueError as e:
         logger.error(f"Error during authentication: {e}")
         return False
 
@@ -3,6 +3,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import SQLALCHEMY_DATABASE_URL
+from app.db.user_cache import invalidate_user
 from models import User, Role
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
@@ -40,6 +41,7 @@ def create_user(username: str, password: str, role_id: int):
 
     # Commit the changes
     session.commit()
+    invalidate_user(username)
     print(f"User '{username}' created and assigned to role '{role.role_name}'.")
 
 
@@ -1,14 +1,115 @@
-from sqlalchemy import create_engine
+"""
+Database Engines and Sessions
+
+The API serves requests through an asynchronous engine (aiosqlite for SQLite, asyncpg for PostgreSQL) so that
+database I/O waits on the event loop instead of occupying threadpool workers. The synchronous engine and
+`SessionLocal` remain for the administrative scripts.
+
+SQLite connections are opened in WAL mode, which lets readers proceed while a write is in progress, with
+`synchronous=NORMAL` and a busy timeout instead of immediate "database is locked" errors.
+"""
+
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import SQLALCHEMY_DATABASE_URL
+from app.core.config import (
+    ASYNC_DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLALCHEMY_DATABASE_URL,
+)
+from app.utils.metrics import db_query_duration
+
+# Async driver used for each synchronous dialect when ASYNC_DATABASE_URL is not set.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def to_async_url(url: str) -> str:
+    """
+    Derive the URL of the async driver from a synchronous database URL.
+
+    Args:
+        url (str): A database URL such as `sqlite:////path/db.sqlite3`.
+
+    Returns:
+        str: The same URL with the matching async driver, e.g. `sqlite+aiosqlite:////path/db.sqlite3`.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or "+" in parsed.drivername:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _pool_options(url: str) -> dict:
+    # In-memory SQLite uses a single static connection, which takes no pool sizing.
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
+def _instrument(engine: Engine) -> None:
+    """Apply the SQLite pragmas and record statement durations for `engine`."""
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        db_query_duration.observe(time.perf_counter() - started, operation)
+
 
 # Create the database engine
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
+_instrument(engine)
 
 # Create a local session factory bound to the engine
 SessionLocal = sessionmaker(bind=engine)
 
+# Async engine used by the API
+async_database_url = ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(
+    async_database_url, **_pool_options(async_database_url)
+)
+_instrument(async_engine.sync_engine)
+
+# Sessions keep loaded attributes after commit, since they cannot lazy-load them again outside a greenlet.
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 
 def get_db():
     """
@@ -29,3 +130,16 @@ def get_db():
         yield db  # Yield the session for use by the caller
     finally:
         db.close()  # Ensure the session is closed after use
+
+
+async def get_async_db():
+    """
+    Dependency providing an async database session for the duration of a request.
+
+    No connection is checked out of the pool until the first query is executed.
+
+    Yields:
+        AsyncSession: The session object for database operations.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -13,6 +13,15 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import SQLALCHEMY_DATABASE_URL
+from app.core.permissions import (
+    ALL_PERMISSIONS,
+    DEVICE_READ,
+    DEVICE_WRITE,
+    FULL_ACCESS,
+    METRICS_READ,
+    NETWORK_WRITE,
+)
+from app.db.user_cache import clear_user_cache
 from models import Base, Permission, Role
 
 
@@ -24,8 +33,10 @@ def init_db():
     1. Connects to the specified SQLite database.
     2. Creates tables if they do not exist.
     3. Populates the tables with a basic set of entities:
-       - A permission named "full_access".
+       - The permissions checked by the API, see `app.core.permissions`.
        - An "Admin" role with the "full_access" permission.
+       - An "Operator" role that can read and configure the device, including its network.
+       - A "Viewer" role that can only read device information and metrics.
     """
     # Create an engine connected to the SQLite database.
     engine = create_engine(SQLALCHEMY_DATABASE_URL)
@@ -37,16 +48,34 @@ def init_db():
     make_session = sessionmaker(bind=engine)
     session = make_session()
 
-    # Create a new permission named "full_access".
-    perm1 = Permission(permission_name="full_access")
+    # Create the permissions checked by the API.
+    permissions = {name: Permission(permission_name=name) for name in ALL_PERMISSIONS}
 
     # Create a new role named "Admin" and assign the "full_access" permission to it.
-    admin_role = Role(role_name="Admin", permissions=[perm1])
+    admin_role = Role(role_name="Admin", permissions=[permissions[FULL_ACCESS]])
 
-    # Add the new user to the session and commit the changes to the database.
-    session.add(admin_role)
+    # Roles with narrower permissions for operators and read-only monitoring.
+    operator_role = Role(
+        role_name="Operator",
+        permissions=[
+            permissions[DEVICE_READ],
+            permissions[DEVICE_WRITE],
+            permissions[NETWORK_WRITE],
+            permissions[METRICS_READ],
+        ],
+    )
+    viewer_role = Role(
+        role_name="Viewer",
+        permissions=[permissions[DEVICE_READ], permissions[METRICS_READ]],
+    )
+
+    # Add the new roles to the session and commit the changes to the database.
+    session.add_all([admin_role, operator_role, viewer_role])
     session.commit()
 
+    # Roles and permissions changed, so cached principals are stale.
+    clear_user_cache()
+
 
 # If the script is run as the main module, initialize the database.
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+"""
+Module: user_cache.py
+
+This module keeps an in-process cache of authenticated user principals so that protected endpoints do not
+query the database on every request. A principal is an immutable snapshot of a `User` row, the names of
+its roles and its effective permissions, detached from any SQLAlchemy session. Roles and permissions are
+resolved once, when the principal is loaded, so a permission check is a set membership test.
+
+Entries expire after `USER_CACHE_TTL` seconds. Code that writes users or roles should call `invalidate_user`
+or `clear_user_cache` so that changes are visible immediately; both also bump the shared "users" generation so
+that every worker process, and the API when the write comes from an administrative script, drops its copy.
+"""
+
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.config import USER_CACHE_SIZE, USER_CACHE_TTL
+from app.core.permissions import FULL_ACCESS
+from app.db.database import AsyncSessionLocal
+from app.db.models import Role, User
+from app.utils.cache import TTLCache
+from app.utils.shared_state import shared_generations
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    Immutable snapshot of an authenticated user.
+
+    Attributes:
+    - user_id: The primary key of the user.
+    - username: The unique username.
+    - roles: The names of the roles assigned to the user.
+    - permissions: The names of the permissions granted by those roles.
+    """
+
+    user_id: int
+    username: str
+    roles: FrozenSet[str]
+    permissions: FrozenSet[str] = frozenset()
+
+    def has_permission(self, permission: str) -> bool:
+        """
+        Check whether the user holds `permission`, either directly or through `full_access`.
+
+        Args:
+        - permission (str): The permission name.
+
+        Returns:
+        - bool: True if the permission is granted.
+        """
+        return permission in self.permissions or FULL_ACCESS in self.permissions
+
+
+user_cache = TTLCache(
+    maxsize=USER_CACHE_SIZE,
+    ttl=USER_CACHE_TTL,
+    generation=lambda: shared_generations.get("users"),
+)
+
+
+async def load_user_principal(username: str) -> Optional[UserPrincipal]:
+    """
+    Load a user principal from the database.
+
+    Roles and their permissions are loaded eagerly with one query per relationship, since an async session
+    cannot lazy-load them.
+
+    Args:
+    - username (str): The username to look up.
+
+    Returns:
+    - UserPrincipal: The principal, or None if no such user exists.
+    """
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(
+            select(User)
+            .options(selectinload(User.roles).selectinload(Role.permissions))
+            .where(User.username == username)
+        )
+        if user is None:
+            return None
+        return UserPrincipal(
+            user_id=user.user_id,
+            username=user.username,
+            roles=frozenset(role.role_name for role in user.roles),
+            permissions=frozenset(
+                permission.permission_name
+                for role in user.roles
+                for permission in role.permissions
+            ),
+        )
+
+
+async def get_user_principal(username: str) -> Optional[UserPrincipal]:
+    """
+    Return the cached principal for `username`, loading it from the database on a miss.
+
+    Args:
+    - username (str): The username to look up.
+
+    Returns:
+    - UserPrincipal: The principal, or None if no such user exists.
+    """
+    principal = user_cache.get(username)
+    if principal is None:
+        principal = await load_user_principal(username)
+        if principal is not None:
+            user_cache.set(username, principal)
+    return principal
+
+
+def invalidate_user(username: str) -> None:
+    """
+    Drop the cached principal for a single user, in this and every other process.
+
+    Args:
+    - username (str): The username whose cache entry should be removed.
+    """
+    user_cache.pop(username)
+    shared_generations.bump("users")
+
+
+def clear_user_cache() -> None:
+    """Drop every cached principal, e.g. after roles or permissions change."""
+    user_cache.clear()
+    shared_generations.bump("users")
+
+
+__all__ = [
+    "UserPrincipal",
+    "get_user_principal",
+    "invalidate_user",
+    "clear_user_cache",
+]
@@ -1,31 +1,68 @@
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from functools import lru_cache
+
+from fastapi import Depends, HTTPException, Request, status
 
 from app.api.v1.admin.authorization import oauth2_scheme
 from app.core.security import decode_token, JWTError
-from app.db.database import get_db
-from app.db.models import User
+from app.db.user_cache import UserPrincipal, get_user_principal
+from app.utils.logger import configure_logger
+from app.utils.metrics import auth_failures
+
+# Setup logging
+logger = configure_logger()
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-):
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = decode_token(token)
+        # Reuse the payload already verified by JWTTokenMiddleware when available.
+        payload = getattr(request.state, "token_payload", None)
+        if payload is None:
+            payload = decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
         # token_data = Token(username=username)
 
-    except JWTError:
+    except JWTError as e:
+        logger.error(f"Token validation error: {e}")
         raise credentials_exception
-    user = db.query(User).filter(User.username == username).first()
+    # Served from the in-process user cache; the database is only hit on a miss.
+    user = await get_user_principal(username)
 
     if user is None:
+        auth_failures.inc("unknown_user")
         raise credentials_exception
     return user
+
+
+@lru_cache(maxsize=None)
+def require_permission(permission: str):
+    """
+    Build a dependency that authenticates the user and requires `permission`.
+
+    The same dependency is returned for the same permission, so FastAPI resolves it once per request.
+
+    Args:
+    - permission (str): The permission name, see `app.core.permissions`.
+
+    Returns:
+    - A dependency returning the authenticated `UserPrincipal`, or raising 403 if the permission is missing.
+    """
+
+    async def check_permission(
+        user: UserPrincipal = Depends(get_current_user),
+    ) -> UserPrincipal:
+        if not user.has_permission(permission):
+            auth_failures.inc("forbidden")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing permission: {permission}",
+            )
+        return user
+
+    return check_permission
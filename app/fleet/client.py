@@ -0,0 +1,333 @@
+"""
+Fleet Client
+
+Queries the read-only endpoints of many LynxAPI devices concurrently, for orchestrators that would otherwise
+call each device in turn.
+
+A single `httpx.AsyncClient` is shared by every request so that connections to each device are kept alive and
+reused for the token request and every endpoint that follows it. The number of requests in flight is bounded
+by `FLEET_CONCURRENCY`, and every request is subject to `FLEET_TIMEOUT`, so one unreachable device costs at most
+a timeout and never stalls the rest of the fleet.
+
+Access tokens are obtained once per device from `/api/admin/token` and cached until shortly before they expire.
+A request rejected with 401 fetches a new token and is retried once. A device refusing the credentials is
+asked for a token only once per run; its other endpoints report the same error without another attempt.
+
+A failure on one device, or on one endpoint of a device, is reported in that device's `errors` while every
+other result is still returned.
+
+Usage:
+    python -m app.fleet.client inventory.json [--endpoint /api/device/info ...]
+
+where `inventory.json` matches `FleetInventory`. The resulting `FleetReport` is printed as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import httpx
+import jwt
+from environs import Env
+
+from app.schemas.fleet import DeviceReport, FleetDevice, FleetInventory, FleetReport
+from app.utils.cache import TTLCache
+
+# The client runs on orchestrators, away from any device, so it reads its own settings instead of
+# app.core.config, which requires the server's secrets.
+env = Env()
+env.read_env()
+
+FLEET_CONCURRENCY = env.int("FLEET_CONCURRENCY", 64)  # Maximum requests in flight
+FLEET_TIMEOUT = env.float("FLEET_TIMEOUT", 5.0)  # Seconds per request
+FLEET_CONNECT_TIMEOUT = env.float("FLEET_CONNECT_TIMEOUT", 2.0)  # Seconds to connect
+FLEET_KEEPALIVE = env.int("FLEET_KEEPALIVE", 512)  # Idle connections kept open
+FLEET_VERIFY_TLS = env.bool("FLEET_VERIFY_TLS", True)  # Verify device certificates
+
+DEFAULT_ENDPOINTS = (
+    "/api/device/info",
+    "/api/system-resources",
+    "/api/device/interfaces",
+)
+TOKEN_PATH = "/api/admin/token"
+
+# Renew tokens this many seconds before they expire to absorb clock skew and request latency.
+TOKEN_EXPIRY_MARGIN = 30.0
+
+
+class FleetError(Exception):
+    """Raised when a device request fails; the message is reported in the device's `errors`."""
+
+
+class FleetClient:
+    """
+    Concurrent client for a fleet of LynxAPI devices.
+
+    Use it as an async context manager so the connection pool is closed when done:
+
+        async with FleetClient() as fleet:
+            report = await fleet.query(devices)
+
+    Attributes:
+    - concurrency: The maximum number of requests in flight across the fleet.
+    - tokens: Cached access tokens keyed by (device URL, username).
+    - auth_failures: Rejected credentials of the current run keyed by (device URL, username).
+    """
+
+    def __init__(
+        self,
+        concurrency: int = FLEET_CONCURRENCY,
+        timeout: float = FLEET_TIMEOUT,
+        connect_timeout: float = FLEET_CONNECT_TIMEOUT,
+        keepalive: int = FLEET_KEEPALIVE,
+        verify: bool = FLEET_VERIFY_TLS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.concurrency = concurrency
+        self.tokens = TTLCache(maxsize=max(keepalive, 1024), ttl=24 * 60 * 60)
+        self.auth_failures: Dict[tuple, FleetError] = {}
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=keepalive
+            ),
+            verify=verify,
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._token_locks: Dict[tuple, asyncio.Lock] = {}
+
+    async def __aenter__(self) -> "FleetClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self._client.aclose()
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async with self._semaphore:
+            try:
+                return await self._client.request(method, url, **kwargs)
+            except httpx.TimeoutException:
+                raise FleetError("Request timed out.")
+            except httpx.HTTPError as e:
+                raise FleetError(f"Request failed: {e.__class__.__name__}: {e}")
+
+    async def get_token(
+        self, device: FleetDevice, rejected: Optional[str] = None
+    ) -> str:
+        """
+        Return an access token for the device, requesting one only if none is cached.
+
+        Concurrent callers for the same device share a single token request, and once the device has
+        refused the credentials (HTTP 401 or 403) the refusal is raised again until the next `query`. Other
+        failures, such as HTTP 429 or 503, are transient: the next caller requests a token again.
+
+        Args:
+        - device (FleetDevice): The device to authenticate against.
+        - rejected (str, optional): A token the device refused; it is discarded if still cached.
+
+        Returns:
+        - str: The access token.
+
+        Raises:
+        - FleetError: If the device rejects the credentials or cannot be reached.
+        """
+        key = (device.url, device.username)
+        token = self.tokens.get(key)
+        if token is not None and token != rejected:
+            return token
+
+        lock = self._token_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            token = self.tokens.get(key)
+            if token is not None and token != rejected:
+                return token
+            if key in self.auth_failures:
+                raise self.auth_failures[key]
+
+            response = await self._send(
+                "POST",
+                device.url.rstrip("/") + TOKEN_PATH,
+                data={
+                    "username": device.username,
+                    "password": device.password.get_secret_value(),
+                },
+            )
+            if response.status_code in (401, 403):
+                self.auth_failures[key] = FleetError(
+                    f"Authentication failed with HTTP {response.status_code}."
+                )
+                raise self.auth_failures[key]
+            if response.status_code != 200:
+                raise FleetError(
+                    f"Authentication failed with HTTP {response.status_code}."
+                )
+            token = response.json().get("access_token")
+            if not token:
+                self.auth_failures[key] = FleetError(
+                    "Authentication response did not contain a token."
+                )
+                raise self.auth_failures[key]
+
+            # The signature is verified by the device; the claim is only read to know when to renew.
+            try:
+                expires_at = jwt.decode(token, options={"verify_signature": False}).get(
+                    "exp"
+                )
+            except jwt.PyJWTError:
+                expires_at = None
+            self.tokens.set(
+                key,
+                token,
+                expires_at=expires_at - TOKEN_EXPIRY_MARGIN if expires_at else None,
+            )
+            return token
+
+    async def fetch(self, device: FleetDevice, path: str):
+        """
+        GET an endpoint of the device as the device's user.
+
+        Args:
+        - device (FleetDevice): The device to query.
+        - path (str): The endpoint path, e.g. `/api/device/info`.
+
+        Returns:
+        - The decoded JSON response body.
+
+        Raises:
+        - FleetError: If the request fails or does not return HTTP 200.
+        """
+        url = device.url.rstrip("/") + path
+        token = await self.get_token(device)
+        response = await self._send(
+            "GET", url, headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code == 401:
+            token = await self.get_token(device, rejected=token)
+            response = await self._send(
+                "GET", url, headers={"Authorization": f"Bearer {token}"}
+            )
+        if response.status_code != 200:
+            raise FleetError(f"HTTP {response.status_code}")
+        try:
+            return response.json()
+        except ValueError:
+            raise FleetError("Response is not valid JSON.")
+
+    async def query_device(
+        self, device: FleetDevice, endpoints: Sequence[str] = DEFAULT_ENDPOINTS
+    ) -> DeviceReport:
+        """
+        Query several endpoints of one device concurrently.
+
+        Args:
+        - device (FleetDevice): The device to query.
+        - endpoints (Sequence[str]): The endpoint paths to request.
+
+        Returns:
+        - DeviceReport: The result of every endpoint that succeeded and an error for every one that failed.
+        """
+        started = time.monotonic()
+        outcomes = await asyncio.gather(
+            *(self.fetch(device, path) for path in endpoints), return_exceptions=True
+        )
+
+        report = DeviceReport(name=device.name, elapsed=0.0)
+        for path, outcome in zip(endpoints, outcomes):
+            if isinstance(outcome, FleetError):
+                report.errors[path] = str(outcome)
+            elif isinstance(outcome, Exception):
+                report.errors[path] = f"{outcome.__class__.__name__}: {outcome}"
+            else:
+                report.results[path] = outcome
+        report.elapsed = round(time.monotonic() - started, 3)
+        return report
+
+    async def query(
+        self,
+        devices: Iterable[FleetDevice],
+        endpoints: Sequence[str] = DEFAULT_ENDPOINTS,
+    ) -> FleetReport:
+        """
+        Query every device in the fleet concurrently.
+
+        Args:
+        - devices (Iterable[FleetDevice]): The devices to query.
+        - endpoints (Sequence[str]): The endpoint paths to request from every device.
+
+        Returns:
+        - FleetReport: One report per device, in the given order, with totals.
+        """
+        # Credentials may have been fixed since the last run, try every device again.
+        self.auth_failures.clear()
+        started = time.monotonic()
+        reports = await asyncio.gather(
+            *(self.query_device(device, endpoints) for device in devices)
+        )
+
+        complete = sum(1 for r in reports if not r.errors)
+        failed = sum(1 for r in reports if r.errors and not r.results)
+        return FleetReport(
+            devices=list(reports),
+            complete=complete,
+            partial=len(reports) - complete - failed,
+            failed=failed,
+            elapsed=round(time.monotonic() - started, 3),
+        )
+
+
+async def query_fleet(
+    devices: Iterable[FleetDevice],
+    endpoints: Sequence[str] = DEFAULT_ENDPOINTS,
+    **options,
+) -> FleetReport:
+    """
+    Query a fleet once with a short-lived `FleetClient`.
+
+    Args:
+    - devices (Iterable[FleetDevice]): The devices to query.
+    - endpoints (Sequence[str]): The endpoint paths to request from every device.
+    - options: Keyword arguments passed to `FleetClient`.
+
+    Returns:
+    - FleetReport: The fleet report.
+    """
+    async with FleetClient(**options) as fleet:
+        return await fleet.query(devices, endpoints)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query a fleet of LynxAPI devices.")
+    parser.add_argument("inventory", help="Path to a JSON inventory file.")
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        dest="endpoints",
+        help="Endpoint path to query; may be repeated. Defaults to info, system resources and interfaces.",
+    )
+    parser.add_argument("--concurrency", type=int, default=FLEET_CONCURRENCY)
+    parser.add_argument("--timeout", type=float, default=FLEET_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    with open(args.inventory, encoding="utf-8") as f:
+        inventory = FleetInventory.model_validate(json.load(f))
+
+    report = asyncio.run(
+        query_fleet(
+            inventory.devices,
+            args.endpoints or DEFAULT_ENDPOINTS,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+        )
+    )
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,66 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import DBAPIError
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 
 from app.api.v1 import device
-from app.api.v1.admin import authorization
-from app.core.config import DOCS, UVICORN_HOST, UVICORN_PORT
+from app.api.v1.admin import authorization, metrics
+from app.collectors.interface_watcher import interface_watcher
+from app.collectors.resources import extended_resources, resource_sampler
+from app.core.config import (
+    DOCS,
+    INTERFACE_WATCHER,
+    RESOURCE_HISTORY,
+    UVICORN_GRACEFUL_TIMEOUT,
+    UVICORN_HOST,
+    UVICORN_PORT,
+    UVICORN_RELOAD,
+    UVICORN_WORKERS,
+)
+from app.db.database import async_engine
 from app.middleware.check_token import JWTTokenMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.network.backends import get_network_backend
 from app.utils.logger import configure_logger
+from app.utils.metrics import multiprocess
 
 # Configure the logger for the application
 logger = configure_logger()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown hook.
+
+    Collects the static device facts once so that the first request does not pay for them, and runs the
+    netlink interface watcher, the resource history sampler and, with several workers, the metric snapshots
+    for the lifetime of the application.
+    An unknown `NETWORK_BACKEND` stops the startup instead of failing every configuration request.
+    """
+    get_network_backend()
+    device.get_info.get_static_device_facts()
+    # Take the counter baseline so the first extended resources call reports real rates.
+    await run_in_threadpool(extended_resources.collect)
+    if INTERFACE_WATCHER:
+        await interface_watcher.start()
+    if RESOURCE_HISTORY:
+        resource_sampler.start()
+    if multiprocess is not None:
+        multiprocess.start()
+    yield
+    await interface_watcher.stop()
+    await resource_sampler.stop()
+    if multiprocess is not None:
+        multiprocess.stop()
+    await async_engine.dispose()
+
+
 # Initialize the FastAPI application with metadata
 app = FastAPI(
     title="RasAPI Documentation",
@@ -22,13 +70,19 @@ app = FastAPI(
     openapi_url="/openapi.json",
     docs_url="/docs" if DOCS else None,
     redoc_url="/redoc" if DOCS else None,
+    lifespan=lifespan,
 )
 
 # Add JWT Token Middleware to the application
 app.add_middleware(JWTTokenMiddleware)
+# Compresses responses; inside the metrics middleware so that timings include compression
+app.add_middleware(CompressionMiddleware)
+# Added last so that it runs first and its timings include token validation
+app.add_middleware(MetricsMiddleware)
 
 # Include the API routers from different modules
 app.include_router(authorization.router, prefix="/api/admin", tags=["admin"])
+app.include_router(metrics.router, tags=["admin"])
 app.include_router(device.get_info.router, prefix="/api", tags=["core"])
 app.include_router(device.get_hostname.router, prefix="/api", tags=["core"])
 app.include_router(device.get_time.router, prefix="/api", tags=["core"])
@@ -38,7 +92,9 @@ app.include_router(device.get_interface_by_name.router, prefix="/api", tags=["co
 app.include_router(device.set_timezone.router, prefix="/api", tags=["core"])
 app.include_router(device.set_hostname.router, prefix="/api", tags=["core"])
 app.include_router(device.set_ip_settings.router, prefix="/api", tags=["core"])
+app.include_router(device.set_network_state.router, prefix="/api", tags=["core"])
 app.include_router(device.set_wifi.router, prefix="/api", tags=["core"])
+app.include_router(device.batch.router, prefix="/api", tags=["core"])
 
 
 @app.exception_handler(HTTPException)
@@ -58,6 +114,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"message": exc.detail},
+        headers=exc.headers,
     )
 
 
@@ -84,7 +141,21 @@ async def sqlalchemy_exception_handler(request: Request, exc: DBAPIError):
 # Run the application with Uvicorn if the script is executed directly
 if __name__ == "__main__":
     try:
-        uvicorn.run("main:app", host=UVICORN_HOST, port=UVICORN_PORT, reload=True)
+        if multiprocess is not None:
+            # Start the metric totals from zero instead of adding the workers of the previous run.
+            multiprocess.clear()
+        uvicorn.run(
+            "main:app",
+            host=UVICORN_HOST,
+            port=UVICORN_PORT,
+            # Several workers share the cache invalidation state in SHARED_STATE_PATH.
+            workers=None if UVICORN_RELOAD else UVICORN_WORKERS,
+            reload=UVICORN_RELOAD,
+            # "auto" selects uvloop and httptools when they are installed.
+            loop="auto",
+            http="auto",
+            timeout_graceful_shutdown=UVICORN_GRACEFUL_TIMEOUT,
+        )
     except Exception as e:
         # Log any exception that occurs when trying to start the server
         logger.critical(f"Failed to start the server: {e}", exc_info=True)
@@ -4,21 +4,129 @@ JWT Token Middleware for FastAPI.
 This middleware intercepts incoming requests to validate the presence and correctness
 of a JWT token provided in the Authorization header. Valid tokens allow the request
 to proceed, while invalid or missing tokens return a 401 Unauthorized response.
+WebSocket handshakes are checked the same way and closed when the token is missing or invalid.
 
 The middleware excludes certain routes from token checking, such as documentation routes
-and the token generation endpoint.
+and the token generation endpoint. They are configured with `EXCLUDED_ROUTES` and compiled once into a
+set of exact paths and a tuple of prefixes.
+
+The decoded payload is stored on `request.state.token_payload` so that downstream dependencies
+can reuse it instead of verifying the same token again.
+
+Requests failing authentication are rate-limited per client IP, taken from `X-Forwarded-For` when the request
+comes from a trusted proxy. Once a client exceeds the limit its failures are answered with 429 without being
+logged. Requests with a valid token are never throttled, so a client sharing its address with an attacker,
+e.g. behind the same NAT, keeps working.
 """
 
-import jwt
-from fastapi import Request, status
-from starlette.responses import JSONResponse
+from typing import Iterable, Optional, Tuple
+
 from starlette.types import ASGIApp, Scope, Receive, Send
 
-from app.core.config import API_SECRET_KEY
+from app.core.config import EXCLUDED_ROUTES, METRICS_PUBLIC
+from app.core.rate_limit import auth_failure_limiter, client_address
+from app.core.security import JWTError, decode_token
+from app.utils.metrics import auth_failures
 from app.utils.logger import configure_logger
 
 logger = configure_logger()
 
+# Response bodies are built once; the middleware answers with raw ASGI messages.
+TOKEN_MISSING_BODY = b'{"detail":"Token is missing"}'
+TOKEN_INVALID_BODY = b'{"detail":"Token is invalid"}'
+TOO_MANY_REQUESTS_BODY = b'{"detail":"Too many unauthorized requests"}'
+
+# WebSocket close code for a connection refused by policy (RFC 6455).
+WS_POLICY_VIOLATION = 1008
+
+
+def compile_exclusions(routes: Iterable[str]) -> Tuple[frozenset, Tuple[str, ...]]:
+    """
+    Split excluded routes into exact paths and path prefixes.
+
+    Args:
+    - routes: Route paths; an entry ending in `*` excludes every path starting with the text before it.
+
+    Returns:
+    - tuple: The frozenset of exact paths and the tuple of prefixes.
+    """
+    exact, prefixes = set(), []
+    for route in routes:
+        if route.endswith("*"):
+            prefixes.append(route[:-1])
+        else:
+            exact.add(route)
+    return frozenset(exact), tuple(prefixes)
+
+
+def get_bearer_token(scope: Scope) -> Optional[str]:
+    """
+    Return the bearer token from the raw Authorization header of an ASGI scope.
+
+    Args:
+    - scope: The ASGI scope of an HTTP request or WebSocket handshake.
+
+    Returns:
+    - str: The token, or None if the header is missing or uses another scheme.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, credentials = value.partition(b" ")
+            if scheme.lower() == b"bearer" and credentials:
+                return credentials.strip().decode("latin-1")
+            return None
+    return None
+
+
+async def send_json(
+    send: Send, status_code: int, body: bytes, headers: Iterable[tuple] = ()
+) -> None:
+    """
+    Send a complete JSON response through the raw ASGI `send` callable.
+
+    Args:
+    - send: The ASGI send callable.
+    - status_code: The HTTP status code.
+    - body: The encoded JSON body.
+    - headers: Additional (name, value) byte pairs.
+    """
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def reject(
+    scope: Scope,
+    send: Send,
+    status_code: int,
+    body: bytes,
+    headers: Iterable[tuple] = (),
+) -> None:
+    """
+    Refuse a request: HTTP requests get a JSON response, WebSocket handshakes are closed.
+
+    Args:
+    - scope: The ASGI scope of the request.
+    - send: The ASGI send callable.
+    - status_code: The HTTP status code of the response.
+    - body: The encoded JSON body of the response.
+    - headers: Additional (name, value) byte pairs of the response.
+    """
+    if scope["type"] == "websocket":
+        # Closing before the handshake is accepted makes the server answer the upgrade with 403.
+        await send({"type": "websocket.close", "code": WS_POLICY_VIOLATION})
+        return
+    await send_json(send, status_code, body, headers)
+
 
 class JWTTokenMiddleware:
     """
@@ -31,70 +139,95 @@ class JWTTokenMiddleware:
     - __call__: The method to intercept requests and check for valid tokens.
     """
 
-    def __init__(self, app: ASGIApp):
+    def __init__(self, app: ASGIApp, excluded_routes: Iterable[str] = EXCLUDED_ROUTES):
         """
         Initialize the JWTTokenMiddleware.
 
         Args:
         - app: The ASGI application instance to forward requests to.
+        - excluded_routes: Paths served without a token, see `compile_exclusions`.
         """
         self.app = app
+        routes = list(excluded_routes)
+        if METRICS_PUBLIC:
+            routes.append("/metrics")
+        self.excluded_paths, self.excluded_prefixes = compile_exclusions(routes)
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Intercept incoming requests to check for valid JWT tokens.
 
+        Works on the raw ASGI scope: only the path, the client address and the Authorization header are
+        read, and rejections are sent as prebuilt responses.
+
         Args:
-        - scope: The ASGI scope for the current request.
+        - scope: The ASGI scope for the current request or WebSocket handshake.
         - receive: The ASGI receive callable.
         - send: The ASGI send callable.
         """
-        request = Request(scope, receive=receive)
-
-        # Check if the request path is in the list of excluded routes.
-        # If so, forward the request without token checking.
-        if request.url.path in [
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/api/admin/token",
-        ]:
+        # Lifespan events belong to no client, forward them untouched. HTTP requests and WebSocket
+        # handshakes are both authenticated.
+        if scope["type"] == "lifespan":
             await self.app(scope, receive, send)
             return
 
-        # Extract the token from the Authorization header.
-        authorization_header = request.headers.get("Authorization")
-        token = (
-            authorization_header.replace("Bearer ", "")
-            if authorization_header
-            else None
-        )
+        # If the request path is excluded, forward the request without token checking.
+        path = scope["path"]
+        if path in self.excluded_paths or (
+            self.excluded_prefixes and path.startswith(self.excluded_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
 
-        # If no token is found, log the unauthorized access attempt and send a custom response.
+        # If no token is found, or it cannot be decoded with the SECRET_KEY, reject the request.
+        token = get_bearer_token(scope)
         if not token:
-            logger.warning(
-                f"Unauthorized access attempt detected from IP {request.client.host}"
-            )
-            response = JSONResponse(
-                content={"detail": "Token is missing"},
-                status_code=status.HTTP_401_UNAUTHORIZED,
-            )
-            await response(scope, receive, send)
+            await self._unauthorized(scope, send, "missing_token", TOKEN_MISSING_BODY)
             return
-
-        # Try to decode the token using the SECRET_KEY.
-        # If decoding fails, log the error and send a custom response.
         try:
-            payload = jwt.decode(token, API_SECRET_KEY, algorithms=["HS256"])
-            request.state.user = payload.get("sub")
-        except jwt.PyJWTError as e:
-            logger.error(f"Token validation error: {e}")
-            response = JSONResponse(
-                content={"detail": "Token is invalid"},
-                status_code=status.HTTP_401_UNAUTHORIZED,
+            payload = decode_token(token)
+        except JWTError as e:
+            await self._unauthorized(
+                scope, send, "invalid_token", TOKEN_INVALID_BODY, e
             )
-            await response(scope, receive, send)
             return
 
+        # Exposed to handlers as `request.state.token_payload` and `request.state.user`.
+        state = scope.setdefault("state", {})
+        state["token_payload"] = payload
+        state["user"] = payload.get("sub")
+
         # If the token is valid, forward the request.
         await self.app(scope, receive, send)
+
+    async def _unauthorized(
+        self,
+        scope: Scope,
+        send: Send,
+        reason: str,
+        body: bytes,
+        error: Optional[Exception] = None,
+    ) -> None:
+        # Only failed requests are charged to the client, which is throttled once it exceeds the limit.
+        client_host = client_address(scope)
+        retry_after = auth_failure_limiter.acquire(client_host)
+        if retry_after:
+            auth_failures.inc("rate_limited")
+            retry_header = str(max(1, int(retry_after + 0.999))).encode()
+            await reject(
+                scope,
+                send,
+                429,
+                TOO_MANY_REQUESTS_BODY,
+                [(b"retry-after", retry_header)],
+            )
+            return
+
+        auth_failures.inc(reason)
+        if error is None:
+            logger.warning(
+                f"Unauthorized access attempt detected from IP {client_host}"
+            )
+        else:
+            logger.error(f"Token validation error: {error}")
+        await reject(scope, send, 401, body)
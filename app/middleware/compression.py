@@ -0,0 +1,203 @@
+"""
+Response Compression Middleware
+
+Compresses JSON and text responses with brotli or gzip, whichever the client prefers in `Accept-Encoding`
+(brotli wins ties and is only offered when the `brotli` package is installed). Bodies smaller than
+`COMPRESSION_MIN_SIZE` bytes are sent as is, since compressing them saves less than it costs.
+
+Responses carrying an `ETag` are compressed once per tag and encoding: the device endpoints tag their bodies
+with a digest of the snapshot they are built from, so a body is compressed when the snapshot changes and the
+result is reused for every client polling it until the next change. Compressed responses carry a weak form of
+the tag, as the compressed bytes differ from the identity representation; `If-None-Match` compares weak tags
+equal to their strong form, so conditional requests keep working.
+
+Streaming responses, such as Server-Sent Events, are passed through untouched.
+"""
+
+import gzip
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_CACHE_SIZE,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+from app.utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Content types worth compressing; everything else (e.g. images) is passed through.
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+# Streamed content types, whose events must not wait for the end of the response.
+STREAMING_TYPES = ("text/event-stream",)
+
+# Seconds a compressed body is reused before it is compressed again.
+COMPRESSION_CACHE_TTL = 300.0
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """
+    Return the content codings this process can produce, in order of preference.
+    """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the content coding for a response from an `Accept-Encoding` header.
+
+    Args:
+    - accept_encoding (str): The header value, e.g. `gzip, deflate, br;q=0.9`.
+
+    Returns:
+    - str: `br` or `gzip`, or None if the client accepts neither.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported_encodings():
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress `body` with the given content coding.
+
+    Args:
+    - body (bytes): The identity-encoded body.
+    - encoding (str): `br` or `gzip`.
+
+    Returns:
+    - bytes: The compressed body.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 makes the output depend on the body only, so equal bodies compress to equal bytes.
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def weak_etag(etag: str) -> str:
+    """Return the weak form of an entity tag."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Middleware negotiating brotli or gzip compression of complete responses.
+
+    Attributes:
+    - app: The ASGI application instance to forward requests to.
+    - minimum_size: Bodies smaller than this many bytes are not compressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        cache_size: int = COMPRESSION_CACHE_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        # (path, etag, encoding) -> compressed body
+        self.cache = TTLCache(maxsize=cache_size, ttl=COMPRESSION_CACHE_TTL)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # HEAD responses have no body to compress.
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start = message
+                if message["status"] == 304:
+                    self._match_validated_etag(scope, message)
+                if not self._compressible(Headers(raw=message["headers"])):
+                    passthrough = True
+                    await send(message)
+                return
+
+            # Only complete bodies are compressed; streams go out as they are produced.
+            if message.get("more_body", False):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            # Small bodies are sent as is, with the headers the application set.
+            body = message.get("body", b"")
+            if len(body) >= self.minimum_size:
+                headers = MutableHeaders(raw=start["headers"])
+                etag = headers.get("etag")
+                body = self._compress(body, encoding, scope["path"], etag)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                if etag is not None:
+                    headers["ETag"] = weak_etag(etag)
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _match_validated_etag(self, scope: Scope, message: Message) -> None:
+        # A 304 carries the tag of the representation the client holds, which is weak if it was compressed.
+        headers = MutableHeaders(raw=message["headers"])
+        etag = headers.get("etag")
+        if etag is None or etag.startswith("W/"):
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        if weak_etag(etag) in if_none_match:
+            headers["ETag"] = weak_etag(etag)
+
+    def _compressible(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "")
+        if "content-encoding" in headers or content_type.startswith(STREAMING_TYPES):
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compress(
+        self, body: bytes, encoding: str, path: str, etag: Optional[str]
+    ) -> bytes:
+        if etag is None:
+            return compress(body, encoding)
+        key = (path, etag, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = compress(body, encoding)
+            self.cache.set(key, compressed)
+        return compressed
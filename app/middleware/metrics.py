@@ -0,0 +1,91 @@
+"""
+Request Metrics Middleware
+
+Records the latency of every HTTP request, labelled with its method, route template and status code, and the
+number of requests in progress. Routes are labelled by template (e.g. `/api/device/interfaces/{interface_name}`)
+rather than by path so that the number of series stays bounded.
+
+It is added as the outermost middleware so that the measured time includes token validation.
+"""
+
+import time
+from typing import Any, Dict
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.cache import TTLCache
+from app.utils.metrics import request_duration, requests_in_flight
+
+# Label for requests that match no route.
+UNMATCHED_ROUTE = "unmatched"
+
+# Route templates of requests answered before routing, keyed by method and path. Bounded, as clients
+# choose the paths.
+UNROUTED_CACHE_SIZE = 1024
+UNROUTED_CACHE_TTL = 3600.0
+
+
+class MetricsMiddleware:
+    """
+    Middleware recording request latency and in-flight requests.
+
+    Attributes:
+    - app: The ASGI application instance to forward requests to.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._templates: Dict[Any, str] = {}
+        self._unrouted = TTLCache(maxsize=UNROUTED_CACHE_SIZE, ttl=UNROUTED_CACHE_TTL)
+
+    def _route_template(self, scope: Scope) -> str:
+        # The router stores the matched endpoint in the scope; its template is looked up once.
+        endpoint = scope.get("endpoint")
+        if endpoint is not None:
+            template = self._templates.get(endpoint)
+            if template is None:
+                template = self._templates[endpoint] = self._match_route(scope)
+            return template
+
+        # Requests rejected before routing (e.g. missing token) are matched once per path.
+        key = (scope["method"], scope["path"])
+        template = self._unrouted.get(key)
+        if template is None:
+            template = self._match_route(scope)
+            self._unrouted.set(key, template)
+        return template
+
+    def _match_route(self, scope: Scope) -> str:
+        router = scope.get("app")
+        for route in getattr(router, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            requests_in_flight.dec()
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                self._route_template(scope),
+                str(status_code),
+            )
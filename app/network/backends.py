@@ -0,0 +1,424 @@
+"""
+Network Backends
+
+Interface configuration requested through the API is applied by a backend, selected with `NETWORK_BACKEND`:
+
+- `script` runs `sudo SCRIPTS_PATH` for every change. Each request pays for a `sudo` and a shell process.
+- `netlink` changes links, addresses and routes directly over rtnetlink from the API process, without
+  spawning anything. The process needs the CAP_NET_ADMIN capability, e.g. `AmbientCapabilities=CAP_NET_ADMIN`
+  in its systemd unit. DHCP needs a DHCP client, and only the network script writes DNS servers to
+  `/etc/resolv.conf`, so DHCP and static configurations with DNS servers are still delegated to the script
+  backend.
+
+Netlink requests are answered by the kernel within microseconds, so concurrent requests no longer queue
+behind the command concurrency limit. Since everything happens over a netlink socket, the netlink backend can
+be exercised inside a network namespace (`unshare -n`) with virtual interfaces.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import struct
+from abc import ABC, abstractmethod
+from contextlib import closing
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Union
+
+from app.core.config import NETWORK_BACKEND, NETWORK_COMMAND_TIMEOUT, SCRIPTS_PATH
+from app.network.state import read_default_route
+from app.utils import netlink
+from app.utils.commands import CommandError, run_command
+
+IPInterface = Union[ipaddress.IPv4Interface, ipaddress.IPv6Interface]
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+DEFAULT_ROUTE = ipaddress.IPv4Network("0.0.0.0/0")
+
+
+class NetworkBackendError(Exception):
+    """Raised when a backend fails to apply a configuration."""
+
+    pass
+
+
+class NetworkBackend(ABC):
+    """
+    Applies interface configurations requested through the API.
+
+    Attributes:
+    - name: The name selecting the backend in `NETWORK_BACKEND`.
+    """
+
+    name = ""
+
+    @abstractmethod
+    async def configure_static(
+        self,
+        interface_name: str,
+        address: ipaddress.IPv4Interface,
+        gateway: Optional[ipaddress.IPv4Address],
+        dns_servers: Sequence[ipaddress.IPv4Address] = (),
+    ) -> None:
+        """
+        Replace the IPv4 addresses of an interface with a static address and set the default gateway.
+
+        Args:
+        - interface_name (str): The interface to configure.
+        - address (IPv4Interface): The address with its prefix length.
+        - gateway (IPv4Address, optional): The default gateway.
+        - dns_servers (list): The DNS servers, passed on to the network script.
+
+        Raises:
+        - NetworkBackendError: If the configuration could not be applied.
+        """
+
+    @abstractmethod
+    async def configure_dhcp(
+        self, interface_name: str, dns_servers: Sequence[ipaddress.IPv4Address] = ()
+    ) -> None:
+        """
+        Obtain the configuration of an interface from a DHCP server.
+
+        Args:
+        - interface_name (str): The interface to configure.
+        - dns_servers (list): Unused, the DHCP server provides the DNS servers.
+
+        Raises:
+        - NetworkBackendError: If the configuration could not be applied.
+        """
+
+
+class ScriptBackend(NetworkBackend):
+    """
+    Backend running the network configuration script with sudo.
+
+    Attributes:
+    - script: The path of the network configuration script.
+    """
+
+    name = "script"
+
+    def __init__(self, script: str = SCRIPTS_PATH):
+        self.script = script
+
+    async def _run(self, args: List[str]) -> None:
+        try:
+            result = await run_command(
+                ["sudo", self.script, *args], timeout=NETWORK_COMMAND_TIMEOUT
+            )
+        except CommandError as e:
+            raise NetworkBackendError(str(e))
+        if result.returncode != 0:
+            raise NetworkBackendError(result.stderr)
+
+    async def configure_static(
+        self,
+        interface_name: str,
+        address: ipaddress.IPv4Interface,
+        gateway: Optional[ipaddress.IPv4Address],
+        dns_servers: Sequence[ipaddress.IPv4Address] = (),
+    ) -> None:
+        # The script takes the DNS servers before the gateway.
+        await self._run(
+            [
+                interface_name,
+                "static",
+                str(address.ip),
+                str(address.network.prefixlen),
+                " ".join(str(dns) for dns in dns_servers),
+                str(gateway) if gateway else "",
+            ]
+        )
+
+    async def configure_dhcp(
+        self, interface_name: str, dns_servers: Sequence[ipaddress.IPv4Address] = ()
+    ) -> None:
+        await self._run([interface_name, "dhcp"])
+
+
+class NetlinkBackend(NetworkBackend):
+    """
+    Backend changing links, addresses and routes over rtnetlink.
+
+    The link, address and route methods are synchronous and return once the kernel has acknowledged the
+    change; `configure_static` runs them in a worker thread.
+
+    Attributes:
+    - script_backend: The backend DHCP configurations and static ones with DNS servers are delegated to.
+    """
+
+    name = "netlink"
+
+    def __init__(self, script_backend: Optional[NetworkBackend] = None):
+        self.script_backend = script_backend or ScriptBackend()
+
+    def _request(self, msg_type: int, flags: int, payload: bytes) -> list:
+        try:
+            with closing(netlink.open_route_socket()) as sock:
+                return netlink.request(sock, msg_type, flags, payload)
+        except OSError as e:
+            raise NetworkBackendError(e.strerror or str(e))
+
+    def _index(self, interface_name: str) -> int:
+        try:
+            return socket.if_nametoindex(interface_name)
+        except OSError:
+            raise NetworkBackendError(f"Interface not found: {interface_name}")
+
+    def _address_payload(self, index: int, address: IPInterface) -> bytes:
+        family = socket.AF_INET if address.version == 4 else socket.AF_INET6
+        payload = netlink.ifaddrmsg(family, address.network.prefixlen, index)
+        packed = address.ip.packed
+        if address.version == 4:
+            payload += netlink.pack_attr(netlink.IFA_LOCAL, packed)
+        payload += netlink.pack_attr(netlink.IFA_ADDRESS, packed)
+        if address.version == 4 and address.network.prefixlen < 31:
+            payload += netlink.pack_attr(
+                netlink.IFA_BROADCAST, address.network.broadcast_address.packed
+            )
+        return payload
+
+    def _route_payload(
+        self,
+        destination: IPNetwork,
+        gateway: Optional[IPAddress],
+        index: int,
+        scope: int,
+    ) -> bytes:
+        family = socket.AF_INET if destination.version == 4 else socket.AF_INET6
+        payload = netlink.rtmsg(family, destination.prefixlen, scope)
+        if destination.prefixlen:
+            payload += netlink.pack_attr(
+                netlink.RTA_DST, destination.network_address.packed
+            )
+        if gateway is not None:
+            payload += netlink.pack_attr(netlink.RTA_GATEWAY, gateway.packed)
+        payload += netlink.pack_attr(netlink.RTA_OIF, struct.pack("=I", index))
+        return payload
+
+    def set_link_state(self, interface_name: str, up: bool) -> None:
+        """
+        Bring an interface up or down.
+
+        Args:
+        - interface_name (str): The interface name.
+        - up (bool): True to bring the interface up.
+        """
+        payload = netlink.ifinfomsg(
+            self._index(interface_name), netlink.IFF_UP if up else 0, netlink.IFF_UP
+        )
+        self._request(netlink.RTM_NEWLINK, 0, payload)
+
+    def list_addresses(
+        self, interface_name: str, version: Optional[int] = None
+    ) -> List[IPInterface]:
+        """
+        List the addresses of an interface.
+
+        Args:
+        - interface_name (str): The interface name.
+        - version (int, optional): 4 or 6 to list only IPv4 or IPv6 addresses.
+
+        Returns:
+        - list: The addresses with their prefix length.
+        """
+        index = self._index(interface_name)
+        family = {4: socket.AF_INET, 6: socket.AF_INET6}.get(version, socket.AF_UNSPEC)
+        messages = self._request(
+            netlink.RTM_GETADDR, netlink.NLM_F_DUMP, netlink.ifaddrmsg(family, 0, 0)
+        )
+
+        addresses = []
+        for message in messages:
+            if message.type != netlink.RTM_NEWADDR:
+                continue
+            family, prefixlen, _, _, msg_index = netlink.IFADDRMSG.unpack_from(
+                message.payload
+            )
+            if msg_index != index:
+                continue
+            attrs = netlink.parse_attrs(message.payload, netlink.IFADDRMSG.size)
+            packed = attrs.get(netlink.IFA_LOCAL) or attrs.get(netlink.IFA_ADDRESS)
+            if packed is None:
+                continue
+            host = ipaddress.ip_address(packed)
+            addresses.append(ipaddress.ip_interface(f"{host}/{prefixlen}"))
+        return addresses
+
+    def add_address(self, interface_name: str, address: IPInterface) -> None:
+        """
+        Add an address to an interface.
+
+        Args:
+        - interface_name (str): The interface name.
+        - address (IPv4Interface | IPv6Interface): The address with its prefix length.
+        """
+        payload = self._address_payload(self._index(interface_name), address)
+        self._request(
+            netlink.RTM_NEWADDR, netlink.NLM_F_CREATE | netlink.NLM_F_EXCL, payload
+        )
+
+    def delete_address(self, interface_name: str, address: IPInterface) -> None:
+        """
+        Remove an address from an interface.
+
+        Args:
+        - interface_name (str): The interface name.
+        - address (IPv4Interface | IPv6Interface): The address with its prefix length.
+        """
+        payload = self._address_payload(self._index(interface_name), address)
+        self._request(netlink.RTM_DELADDR, 0, payload)
+
+    def replace_route(
+        self,
+        destination: IPNetwork,
+        gateway: Optional[IPAddress],
+        interface_name: str,
+    ) -> None:
+        """
+        Add a route, replacing any route to the same destination.
+
+        Args:
+        - destination (IPv4Network | IPv6Network): The destination, e.g. `0.0.0.0/0` for the default route.
+        - gateway (IPv4Address | IPv6Address, optional): The next hop; None for a directly connected route.
+        - interface_name (str): The outgoing interface.
+        """
+        scope = netlink.RT_SCOPE_UNIVERSE if gateway else netlink.RT_SCOPE_LINK
+        payload = self._route_payload(
+            destination, gateway, self._index(interface_name), scope
+        )
+        self._request(
+            netlink.RTM_NEWROUTE,
+            netlink.NLM_F_CREATE | netlink.NLM_F_REPLACE,
+            payload,
+        )
+
+    def delete_route(
+        self,
+        destination: IPNetwork,
+        gateway: Optional[IPAddress],
+        interface_name: str,
+    ) -> None:
+        """
+        Remove a route.
+
+        Args:
+        - destination (IPv4Network | IPv6Network): The destination of the route.
+        - gateway (IPv4Address | IPv6Address, optional): The next hop of the route.
+        - interface_name (str): The outgoing interface of the route.
+        """
+        payload = self._route_payload(
+            destination,
+            gateway,
+            self._index(interface_name),
+            netlink.RT_SCOPE_NOWHERE,
+        )
+        self._request(netlink.RTM_DELROUTE, 0, payload)
+
+    def _configure_static(
+        self,
+        interface_name: str,
+        address: ipaddress.IPv4Interface,
+        gateway: Optional[ipaddress.IPv4Address],
+    ) -> None:
+        current = self.list_addresses(interface_name, version=4)
+        stale = [existing for existing in current if existing != address]
+        previous_route = read_default_route()
+        # The new address is added first so the interface stays reachable, unless it shares a subnet with a
+        # stale address: the kernel deletes secondary addresses along with their primary address.
+        add_first = address not in current and all(
+            existing.network != address.network for existing in stale
+        )
+
+        added, removed = False, []
+        try:
+            if add_first:
+                self.add_address(interface_name, address)
+                added = True
+            for existing in stale:
+                self.delete_address(interface_name, existing)
+                removed.append(existing)
+            if address not in current and not added:
+                self.add_address(interface_name, address)
+                added = True
+            if gateway is not None:
+                self.replace_route(DEFAULT_ROUTE, gateway, interface_name)
+        except NetworkBackendError:
+            self._restore(interface_name, address if added else None, removed)
+            if (
+                previous_route is not None
+                and previous_route.interface == interface_name
+            ):
+                self._try(
+                    self.replace_route,
+                    DEFAULT_ROUTE,
+                    previous_route.gateway,
+                    interface_name,
+                )
+            raise
+
+    def _restore(
+        self,
+        interface_name: str,
+        added: Optional[ipaddress.IPv4Interface],
+        removed: List[ipaddress.IPv4Interface],
+    ) -> None:
+        # Best effort: restore as much of the previous configuration as possible.
+        if added is not None:
+            self._try(self.delete_address, interface_name, added)
+        for existing in removed:
+            self._try(self.add_address, interface_name, existing)
+
+    def _try(self, method: Callable[..., None], *args) -> None:
+        try:
+            method(*args)
+        except NetworkBackendError:
+            pass
+
+    async def configure_static(
+        self,
+        interface_name: str,
+        address: ipaddress.IPv4Interface,
+        gateway: Optional[ipaddress.IPv4Address],
+        dns_servers: Sequence[ipaddress.IPv4Address] = (),
+    ) -> None:
+        # Only the network script writes the resolver configuration.
+        if dns_servers:
+            await self.script_backend.configure_static(
+                interface_name, address, gateway, dns_servers
+            )
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._configure_static, interface_name, address, gateway
+        )
+
+    async def configure_dhcp(
+        self, interface_name: str, dns_servers: Sequence[ipaddress.IPv4Address] = ()
+    ) -> None:
+        await self.script_backend.configure_dhcp(interface_name, dns_servers)
+
+
+BACKENDS = {backend.name: backend for backend in (ScriptBackend, NetlinkBackend)}
+
+
+@lru_cache(maxsize=None)
+def get_network_backend(name: str = NETWORK_BACKEND) -> NetworkBackend:
+    """
+    Return the network backend with the given name, created on first use.
+
+    Args:
+    - name (str): `script` or `netlink`.
+
+    Returns:
+    - NetworkBackend: The backend instance.
+
+    Raises:
+    - ValueError: If no backend has that name.
+    """
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown network backend '{name}', expected one of: {', '.join(BACKENDS)}"
+        )
@@ -0,0 +1,146 @@
+"""
+Network Configuration Engine
+
+Applies a desired-state document for many interfaces as one transaction. The desired state is compared with
+the current configuration, and only the changes needed are written to a single `sudo ip -batch -` process,
+so reconfiguring a multi-homed device costs one privileged exec regardless of the number of interfaces.
+
+`ip -batch` stops at the first failing line. The lines applied before it are then undone, in reverse order,
+by a second batch run with `-force` so that one failing undo does not prevent the others. Transactions are
+serialized within a worker process, so two requests never diff against the same state.
+"""
+
+import asyncio
+import re
+from typing import List, NamedTuple, Optional
+
+from app.collectors.interfaces import interface_snapshot
+from app.core.config import NETWORK_COMMAND_TIMEOUT
+from app.network.state import Change, current_state, plan_changes
+from app.schemas.network_state import NetworkState
+from app.utils.commands import (
+    CommandError,
+    CommandResult,
+    CommandTimeoutError,
+    run_command,
+)
+from app.utils.logger import configure_logger
+
+logger = configure_logger()
+
+IP_BATCH_COMMAND = ("sudo", "ip", "-batch", "-")
+IP_FORCE_BATCH_COMMAND = ("sudo", "ip", "-force", "-batch", "-")
+
+# `ip -batch` reports the failing line as "Command failed <file>:<line>".
+FAILED_LINE = re.compile(r"Command failed \S*:(\d+)")
+
+_lock: Optional[asyncio.Lock] = None
+
+
+class NetworkApplyError(Exception):
+    """Raised when a transaction fails; `rolled_back` tells whether the previous state was restored."""
+
+    def __init__(self, message: str, failed_command: Optional[str], rolled_back: bool):
+        super().__init__(message)
+        self.failed_command = failed_command
+        self.rolled_back = rolled_back
+
+
+class NetworkTransaction(NamedTuple):
+    """Outcome of a transaction."""
+
+    changes: List[str]
+    applied: bool
+
+
+def _get_lock() -> asyncio.Lock:
+    global _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+    return _lock
+
+
+def _batch(lines: List[str]) -> bytes:
+    return "".join(f"{line}\n" for line in lines).encode()
+
+
+def _applied_count(result: Optional[CommandResult], total: int) -> int:
+    # Without a line number, e.g. after a timeout, any of the changes may have been applied.
+    match = FAILED_LINE.search(result.stderr) if result is not None else None
+    return int(match.group(1)) - 1 if match else total
+
+
+async def rollback(changes: List[Change]) -> bool:
+    """
+    Undo applied changes, most recent first.
+
+    Args:
+    - changes (list): The changes that were applied, in the order they were applied.
+
+    Returns:
+    - bool: True if every undo line succeeded.
+    """
+    if not changes:
+        return True
+    try:
+        result = await run_command(
+            IP_FORCE_BATCH_COMMAND,
+            timeout=NETWORK_COMMAND_TIMEOUT,
+            input=_batch([change.undo for change in reversed(changes)]),
+        )
+    except CommandError as e:
+        logger.error(f"Network rollback failed: {e}")
+        return False
+    if result.returncode != 0:
+        logger.error(f"Network rollback failed: {result.stderr.strip()}")
+        return False
+    return True
+
+
+async def apply_network_state(desired: NetworkState) -> NetworkTransaction:
+    """
+    Bring the interfaces into the desired state in one `ip -batch` transaction.
+
+    Args:
+    - desired (NetworkState): The desired state; with `dry_run` set the changes are only computed.
+
+    Returns:
+    - NetworkTransaction: The `ip` commands of the changes and whether they were applied.
+
+    Raises:
+    - NetworkStateError: If the desired state is invalid for this device, see `plan_changes`.
+    - NetworkApplyError: If applying the changes failed.
+    """
+    async with _get_lock():
+        links, default_route = current_state()
+        changes = plan_changes(desired, links, default_route)
+        commands = [change.command for change in changes]
+        if desired.dry_run or not changes:
+            return NetworkTransaction(commands, False)
+
+        result = None
+        try:
+            result = await run_command(
+                IP_BATCH_COMMAND,
+                timeout=NETWORK_COMMAND_TIMEOUT,
+                input=_batch(commands),
+            )
+            error = result.stderr.strip()
+        except CommandTimeoutError as e:
+            error = str(e)
+        except CommandError as e:
+            # ip could not be started, so nothing was applied.
+            raise NetworkApplyError(str(e), None, True)
+
+        try:
+            if result is not None and result.returncode == 0:
+                return NetworkTransaction(commands, True)
+
+            applied = _applied_count(result, len(changes))
+            failed_command = commands[applied] if applied < len(changes) else None
+            logger.error(f"Network transaction failed, rolling back: {error}")
+            rolled_back = await rollback(changes[:applied])
+            raise NetworkApplyError(error, failed_command, rolled_back)
+        finally:
+            # The interface table changed, or may have, drop every worker's snapshot.
+            interface_snapshot.invalidate(shared=True)
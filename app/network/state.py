@@ -0,0 +1,252 @@
+"""
+Network State
+
+Reads the current configuration of the network interfaces and computes the changes needed to reach a desired
+state. The current state is taken from a fresh interface snapshot and `/proc/net/route`, so no process is
+spawned to read it.
+
+Every change is an `ip -batch` line paired with the line undoing it, which lets a failed transaction be
+rolled back to the state it started from.
+"""
+
+import ipaddress
+import socket
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+
+from app.collectors.interfaces import InterfaceRecord, interface_snapshot
+from app.schemas.network_state import NetworkState
+
+IPInterface = Union[ipaddress.IPv4Interface, ipaddress.IPv6Interface]
+
+ROUTE_TABLE_PATH = "/proc/net/route"
+
+
+class NetworkStateError(ValueError):
+    """Raised when a desired state cannot be applied to the interfaces of this device."""
+
+    pass
+
+
+class LinkState(NamedTuple):
+    """The current configuration of one network interface."""
+
+    name: str
+    up: bool
+    mtu: int
+    addresses: FrozenSet[IPInterface]
+
+
+class DefaultRoute(NamedTuple):
+    """The current IPv4 default route."""
+
+    interface: str
+    gateway: ipaddress.IPv4Address
+
+
+class Change(NamedTuple):
+    """An `ip -batch` line and the lines restoring the state it changes."""
+
+    command: str
+    undo: str
+
+
+def _prefix_length(netmask: str) -> int:
+    return bin(int(ipaddress.ip_address(netmask))).count("1")
+
+
+def _link_state(record: InterfaceRecord) -> LinkState:
+    addresses = set()
+    for address in record.addresses:
+        if (
+            address.family not in (socket.AF_INET, socket.AF_INET6)
+            or not address.netmask
+        ):
+            continue
+        # psutil reports IPv6 link-local addresses with a `%scope` suffix.
+        host = address.address.split("%", 1)[0]
+        addresses.add(
+            ipaddress.ip_interface(f"{host}/{_prefix_length(address.netmask)}")
+        )
+    return LinkState(record.name, record.isup, record.mtu, frozenset(addresses))
+
+
+def read_links() -> Dict[str, LinkState]:
+    """
+    Read the current state of every network interface.
+
+    Returns:
+    - dict: Link states keyed by interface name.
+    """
+    return {
+        name: _link_state(record)
+        for name, record in interface_snapshot.refresh().items()
+    }
+
+
+def read_default_route(path: str = ROUTE_TABLE_PATH) -> Optional[DefaultRoute]:
+    """
+    Read the IPv4 default route with the lowest metric from the kernel routing table.
+
+    Args:
+    - path (str): The routing table in `/proc/net/route` format.
+
+    Returns:
+    - DefaultRoute: The interface and gateway of the default route, or None if there is none.
+    """
+    best = None
+    try:
+        with open(path, "r") as f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split()
+                if (
+                    len(fields) < 8
+                    or fields[1] != "00000000"
+                    or fields[7] != "00000000"
+                ):
+                    continue
+                # Addresses are little-endian hex; skip routes without a gateway.
+                gateway = ipaddress.IPv4Address(
+                    int(fields[2], 16).to_bytes(4, "little")
+                )
+                metric = int(fields[6])
+                if int(gateway) and (best is None or metric < best[0]):
+                    best = (metric, DefaultRoute(fields[0], gateway))
+    except OSError:
+        return None
+    return best[1] if best else None
+
+
+def _address_args(address: IPInterface) -> str:
+    # IPv4 addresses get the broadcast address of their subnet, as `ip` does not set one by default.
+    if address.version == 4:
+        return f"{address.with_prefixlen} broadcast +"
+    return address.with_prefixlen
+
+
+def plan_changes(
+    desired: NetworkState,
+    links: Dict[str, LinkState],
+    default_route: Optional[DefaultRoute] = None,
+) -> List[Change]:
+    """
+    Compute the changes turning the current interface configuration into the desired one.
+
+    Changes are ordered so that the MTU is set first, then new addresses are added before stale ones are
+    removed, links are brought up or down and the default route is replaced last. An IPv4 address in the
+    subnet of a removed one is added after the removal instead, since the kernel deletes the secondary
+    addresses of a subnet along with its primary address unless `promote_secondaries` is set.
+
+    Removing the address through which the default gateway is reached makes the kernel drop the default
+    route, so the route is replaced again after the removals even when the gateway stays the same.
+
+    Args:
+    - desired (NetworkState): The desired state of the interfaces to configure.
+    - links (dict): The current link states keyed by interface name, as returned by `read_links`.
+    - default_route (DefaultRoute, optional): The current IPv4 default route.
+
+    Returns:
+    - list: The changes to apply, empty if the interfaces are already in the desired state.
+
+    Raises:
+    - NetworkStateError: If an interface does not exist or the desired state is inconsistent.
+    """
+    names = [interface.name for interface in desired.interfaces]
+    if len(names) != len(set(names)):
+        raise NetworkStateError("Each interface may only appear once.")
+    if sum(interface.gateway is not None for interface in desired.interfaces) > 1:
+        raise NetworkStateError("Only one interface may set the default gateway.")
+
+    mtu, added, removed, readded, link, route = [], [], [], [], [], []
+    restore_route = False
+    for interface in desired.interfaces:
+        current = links.get(interface.name)
+        if current is None:
+            raise NetworkStateError(f"Interface not found: {interface.name}")
+        name = interface.name
+
+        if interface.mtu is not None and interface.mtu != current.mtu:
+            mtu.append(
+                Change(
+                    f"link set dev {name} mtu {interface.mtu}",
+                    f"link set dev {name} mtu {current.mtu}",
+                )
+            )
+
+        if interface.addresses is not None:
+            wanted = frozenset(interface.addresses)
+            stale_networks = set()
+            for address in sorted(current.addresses - wanted, key=str):
+                if address.version == 6 and address.is_link_local:
+                    continue
+                undo = f"address add {_address_args(address)} dev {name}"
+                # The kernel drops the default route along with the address its gateway is reached through.
+                if (
+                    default_route is not None
+                    and default_route.interface == name
+                    and default_route.gateway in address.network
+                ):
+                    undo += f"\nroute replace default via {default_route.gateway} dev {name}"
+                    restore_route = True
+                if address.version == 4:
+                    stale_networks.add(address.network)
+                removed.append(
+                    Change(f"address del {address.with_prefixlen} dev {name}", undo)
+                )
+            for address in sorted(wanted - current.addresses, key=str):
+                change = Change(
+                    f"address add {_address_args(address)} dev {name}",
+                    f"address del {address.with_prefixlen} dev {name}",
+                )
+                if address.version == 4 and address.network in stale_networks:
+                    readded.append(change)
+                else:
+                    added.append(change)
+
+        if interface.up is not None and interface.up != current.up:
+            state, previous = ("up", "down") if interface.up else ("down", "up")
+            link.append(
+                Change(
+                    f"link set dev {name} {state}", f"link set dev {name} {previous}"
+                )
+            )
+
+        if interface.gateway is not None:
+            if interface.up is False:
+                raise NetworkStateError(
+                    f"A gateway cannot be set on an interface brought down: {name}"
+                )
+            if default_route != (name, interface.gateway):
+                if default_route is None:
+                    undo = f"route del default via {interface.gateway} dev {name}"
+                else:
+                    undo = (
+                        f"route replace default via {default_route.gateway} "
+                        f"dev {default_route.interface}"
+                    )
+                route.append(
+                    Change(
+                        f"route replace default via {interface.gateway} dev {name}",
+                        undo,
+                    )
+                )
+
+    # Unless another default route is set, put back the one dropped with the address of its gateway.
+    if restore_route and not route:
+        restore = (
+            f"route replace default via {default_route.gateway} "
+            f"dev {default_route.interface}"
+        )
+        route.append(Change(restore, restore))
+
+    return mtu + added + removed + readded + link + route
+
+
+def current_state() -> Tuple[Dict[str, LinkState], Optional[DefaultRoute]]:
+    """
+    Read the current link states and default route.
+
+    Returns:
+    - tuple: The link states keyed by interface name and the IPv4 default route.
+    """
+    return read_links(), read_default_route()
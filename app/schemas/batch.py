@@ -0,0 +1,60 @@
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.info import HostnameResponse, SystemInfoResponse, TimeDetails
+from app.schemas.interfaces import InterfacesResponse
+from app.schemas.system_resources import ExtendedSystemResources, SystemResources
+
+BatchQuery = Literal[
+    "info",
+    "hostname",
+    "clock",
+    "interfaces",
+    "system_resources",
+    "system_resources_extended",
+]
+
+
+class BatchRequest(BaseModel):
+    """
+    Represents a batch of read-only device queries answered in a single request.
+    """
+
+    queries: List[BatchQuery] = Field(
+        ...,
+        min_length=1,
+        description="The device queries to run. Each name matches the endpoint returning the same data.",
+        examples=[["info", "hostname", "clock", "interfaces", "system_resources"]],
+    )
+
+
+class BatchResults(BaseModel):
+    info: Optional[SystemInfoResponse] = Field(
+        default=None, description="The result of `/device/info`."
+    )
+    hostname: Optional[HostnameResponse] = Field(
+        default=None, description="The result of `/device/hostname`."
+    )
+    clock: Optional[TimeDetails] = Field(
+        default=None, description="The result of `/device/clock`."
+    )
+    interfaces: Optional[InterfacesResponse] = Field(
+        default=None, description="The result of `/device/interfaces`."
+    )
+    system_resources: Optional[SystemResources] = Field(
+        default=None, description="The result of `/system-resources`."
+    )
+    system_resources_extended: Optional[ExtendedSystemResources] = Field(
+        default=None, description="The result of `/system-resources/extended`."
+    )
+
+
+class BatchResponse(BaseModel):
+    results: BatchResults = Field(
+        description="The result of every query that succeeded, keyed by query name."
+    )
+    errors: Dict[str, str] = Field(
+        default_factory=dict,
+        description="An error message for every query that failed, keyed by query name.",
+    )
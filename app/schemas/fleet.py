@@ -0,0 +1,59 @@
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field, SecretStr
+
+
+class FleetDevice(BaseModel):
+    """
+    Represents a single LynxAPI device in a fleet inventory.
+    """
+
+    name: str = Field(
+        ..., example="gateway-01", description="A unique name for the device."
+    )
+    url: str = Field(
+        ...,
+        example="https://10.0.0.1:8081",
+        description="The base URL of the device's LynxAPI, without the `/api` prefix.",
+    )
+    username: str = Field(..., description="The API user to authenticate as.")
+    password: SecretStr = Field(..., description="The password of the API user.")
+
+
+class FleetInventory(BaseModel):
+    """
+    Represents the devices queried by the fleet client.
+    """
+
+    devices: List[FleetDevice] = Field(
+        ..., description="The devices to query. Device names must be unique."
+    )
+
+
+class DeviceReport(BaseModel):
+    name: str = Field(description="The name of the device.")
+    results: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="The response body of every endpoint that succeeded, keyed by endpoint path.",
+    )
+    errors: Dict[str, str] = Field(
+        default_factory=dict,
+        description="An error message for every endpoint that failed, keyed by endpoint path.",
+    )
+    elapsed: float = Field(description="Seconds spent querying the device.")
+
+
+class FleetReport(BaseModel):
+    devices: List[DeviceReport] = Field(
+        description="One report per device, in inventory order."
+    )
+    complete: int = Field(
+        description="The number of devices where every endpoint succeeded."
+    )
+    partial: int = Field(
+        description="The number of devices where some endpoints failed."
+    )
+    failed: int = Field(
+        description="The number of devices where every endpoint failed."
+    )
+    elapsed: float = Field(description="Seconds spent querying the whole fleet.")
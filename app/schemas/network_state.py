@@ -0,0 +1,64 @@
+from ipaddress import IPv4Address
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, IPvAnyInterface
+
+
+class InterfaceState(BaseModel):
+    """
+    The desired state of one network interface. Fields left unset are not changed.
+    """
+
+    name: str = Field(
+        ...,
+        description="The name of the network interface (e.g., eth0, wlan0).",
+        examples=["eth0"],
+    )
+    up: Optional[bool] = Field(
+        default=None,
+        description="Whether the interface should be up (administratively enabled) or down.",
+        examples=[True],
+    )
+    mtu: Optional[int] = Field(
+        default=None,
+        description="The Maximum Transmission Unit of the interface.",
+        examples=[1500],
+        ge=68,
+        le=65535,
+    )
+    addresses: Optional[List[IPvAnyInterface]] = Field(
+        default=None,
+        description="The complete list of IPv4 and IPv6 addresses, with prefix length, the interface should have. "
+        "Addresses not listed are removed, except IPv6 link-local addresses; an empty list removes all of them.",
+        examples=[["192.168.1.100/24", "fd00::100/64"]],
+    )
+    gateway: Optional[IPv4Address] = Field(
+        default=None,
+        description="The default IPv4 gateway, reached through this interface.",
+        examples=["192.168.1.1"],
+    )
+
+
+class NetworkState(BaseModel):
+    """
+    Represents the desired network configuration of several interfaces, applied as one transaction.
+    """
+
+    interfaces: List[InterfaceState] = Field(
+        ...,
+        min_length=1,
+        description="The desired state of each interface to configure.",
+    )
+    dry_run: bool = Field(
+        default=False,
+        description="Only compute and return the changes, without applying them.",
+    )
+
+
+class NetworkStateResult(BaseModel):
+    changes: List[str] = Field(
+        description="The `ip` commands needed to reach the desired state, in the order they are applied."
+    )
+    applied: bool = Field(
+        description="Whether the changes were applied; false for a dry run or when nothing had to change."
+    )
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import BaseModel, Field
 
 
@@ -14,8 +16,8 @@ class SystemResources(BaseModel):
         title="CPU Usage Percentage",
         description="The percentage of CPU utilization.",
         example=55.5,
-        gt=0,
-        lt=100,
+        ge=0,
+        le=100,
         units="%",
     )
 
@@ -24,8 +26,8 @@ class SystemResources(BaseModel):
         title="Memory Usage Percentage",
         description="The percentage of memory (RAM) utilization.",
         example=70.3,
-        gt=0,
-        lt=100,
+        ge=0,
+        le=100,
         units="%",
     )
 
@@ -34,7 +36,122 @@ class SystemResources(BaseModel):
         title="Disk Usage Percentage",
         description="The percentage of disk space utilization on the root partition.",
         example=82.2,
-        gt=0,
-        lt=100,
+        ge=0,
+        le=100,
         units="%",
     )
+
+
+class ResourceStats(BaseModel):
+    """
+    Summary of one metric over a history bucket.
+    """
+
+    min: float = Field(..., description="The lowest value recorded in the bucket.")
+    max: float = Field(..., description="The highest value recorded in the bucket.")
+    avg: float = Field(
+        ..., description="The average of the values recorded in the bucket."
+    )
+
+
+class ResourceHistoryBucket(BaseModel):
+    """
+    Resource usage aggregated over one time bucket.
+    """
+
+    start: float = Field(..., description="UNIX timestamp at which the bucket starts.")
+    end: float = Field(..., description="UNIX timestamp at which the bucket ends.")
+    samples: int = Field(..., description="The number of samples in the bucket.")
+    cpu_usage_percent: ResourceStats = Field(
+        ..., description="CPU utilization percentage over the bucket."
+    )
+    memory_usage_percent: ResourceStats = Field(
+        ..., description="Memory (RAM) utilization percentage over the bucket."
+    )
+    disk_usage_percent: ResourceStats = Field(
+        ..., description="Root partition utilization percentage over the bucket."
+    )
+
+
+class ResourceHistory(BaseModel):
+    """
+    System Resource History Data Model
+
+    Downsampled resource usage recorded by the background sampler.
+    """
+
+    interval: float = Field(..., description="Seconds between recorded samples.")
+    buckets: List[ResourceHistoryBucket] = Field(
+        ..., description="The non-empty buckets of the requested window, oldest first."
+    )
+
+
+class LoadAverage(BaseModel):
+    one: float = Field(
+        ..., description="Average number of runnable processes over 1 minute."
+    )
+    five: float = Field(
+        ..., description="Average number of runnable processes over 5 minutes."
+    )
+    fifteen: float = Field(
+        ..., description="Average number of runnable processes over 15 minutes."
+    )
+
+
+class SwapUsage(BaseModel):
+    total: int = Field(..., description="Total swap space in bytes.")
+    used: int = Field(..., description="Used swap space in bytes.")
+    percent: float = Field(..., description="The percentage of swap space in use.")
+
+
+class DiskUsage(BaseModel):
+    device: str = Field(..., description="The block device backing the mount.")
+    mountpoint: str = Field(..., description="The path the partition is mounted on.")
+    fstype: str = Field(..., description="The filesystem type.")
+    total: int = Field(..., description="Total size of the partition in bytes.")
+    used: int = Field(..., description="Used space in bytes.")
+    free: int = Field(..., description="Free space in bytes.")
+    percent: float = Field(..., description="The percentage of space in use.")
+
+
+class DiskIORates(BaseModel):
+    read_bytes_per_sec: float = Field(..., description="Bytes read per second.")
+    write_bytes_per_sec: float = Field(..., description="Bytes written per second.")
+    read_ops_per_sec: float = Field(..., description="Read operations per second.")
+    write_ops_per_sec: float = Field(..., description="Write operations per second.")
+
+
+class NetworkIORates(BaseModel):
+    sent_bytes_per_sec: float = Field(..., description="Bytes sent per second.")
+    recv_bytes_per_sec: float = Field(..., description="Bytes received per second.")
+    sent_packets_per_sec: float = Field(..., description="Packets sent per second.")
+    recv_packets_per_sec: float = Field(..., description="Packets received per second.")
+
+
+class ExtendedSystemResources(BaseModel):
+    """
+    Extended System Resources Data Model
+
+    Detailed resource usage, including per-core CPU utilization and I/O rates. Utilization and rates are
+    measured over `interval` seconds, the time since the previous collection.
+    """
+
+    interval: float = Field(
+        ..., description="Seconds over which utilization and rates were measured."
+    )
+    cpu_usage_percent: float = Field(
+        ..., description="The percentage of CPU utilization across all cores."
+    )
+    per_cpu_percent: List[float] = Field(
+        ..., description="The percentage of utilization of each logical CPU."
+    )
+    load_average: LoadAverage = Field(..., description="The system load average.")
+    memory_usage_percent: float = Field(
+        ..., description="The percentage of memory (RAM) utilization."
+    )
+    swap: SwapUsage = Field(..., description="Swap space usage.")
+    disks: List[DiskUsage] = Field(..., description="Usage of every mounted partition.")
+    disk_io: DiskIORates = Field(..., description="Disk I/O rates across all disks.")
+    network_io: NetworkIORates = Field(
+        ..., description="Network I/O rates across all interfaces."
+    )
@@ -70,6 +70,12 @@ elif [ "$MODE" == "static" ]; then
     if [ ! -z "$GATEWAY" ]; then
         ip route add default via $GATEWAY
     fi
+
+    # Write the DNS servers, if specified, to the resolver configuration
+    if [ ! -z "$DNS_SERVERS" ]; then
+        printf 'nameserver %s\n' $DNS_SERVERS > /etc/resolv.conf
+        log "DNS servers set to $DNS_SERVERS"
+    fi
 else
     log "Invalid mode specified: $MODE. Use 'dhcp' or 'static'."
     exit 1
@@ -0,0 +1,87 @@
+"""
+Broadcast Helpers
+
+A small publish/subscribe primitive used to push updates produced by one background task to any number of
+streaming clients, plus a formatter for Server-Sent Events.
+
+Subscribers only ever see the most recent value: a slow client skips intermediate updates instead of
+building up an unbounded backlog, so the publisher's cost does not depend on how fast clients read.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Optional, Set
+
+
+class Broadcaster:
+    """
+    Fan out published values to all current subscribers.
+
+    Attributes:
+    - latest: The most recently published value, or None before the first publish.
+    """
+
+    def __init__(self):
+        self.latest: Any = None
+        self._queues: Set[asyncio.Queue] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._queues)
+
+    def publish(self, value: Any) -> None:
+        """
+        Deliver `value` to every subscriber, replacing any value it has not consumed yet.
+
+        Args:
+        - value (Any): The value to publish.
+        """
+        self.latest = value
+        for queue in self._queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(value)
+
+    async def subscribe(
+        self, heartbeat: Optional[float] = None, replay_latest: bool = True
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate over published values until the consumer stops.
+
+        Args:
+        - heartbeat (float, optional): Yield None when nothing was published for this many seconds,
+          so that streaming responses can send keep-alives.
+        - replay_latest (bool): Start with the most recent value if there is one.
+
+        Yields:
+        - Any: Published values, or None on heartbeat.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        if replay_latest and self.latest is not None:
+            queue.put_nowait(self.latest)
+        self._queues.add(queue)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._queues.discard(queue)
+
+
+def sse_event(data: Optional[str], event: Optional[str] = None) -> str:
+    """
+    Format a Server-Sent Events message.
+
+    Args:
+    - data (str, optional): The event payload. None produces a keep-alive comment.
+    - event (str, optional): The event name.
+
+    Returns:
+    - str: The wire representation of the event.
+    """
+    if data is None:
+        return ": keep-alive\n\n"
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
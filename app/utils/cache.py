@@ -0,0 +1,117 @@
+"""
+In-process TTL Cache
+
+A small, bounded, thread-safe mapping whose entries expire at an absolute deadline. It is shared by the
+authentication layer and the device collectors to keep hot values in memory between requests.
+
+Entries are evicted in least-recently-used order once the cache is full, and lazily dropped on access
+once their deadline has passed. A cache can also follow an external generation counter (see
+`app.utils.shared_state`) and is emptied whenever that counter changes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded least-recently-used cache with a per-entry expiry time.
+
+    Attributes:
+    - maxsize: The maximum number of entries kept in the cache.
+    - ttl: The default lifetime of an entry in seconds, used when no explicit deadline is given.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        generation: Optional[Callable[[], int]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+        - maxsize (int): The maximum number of entries kept in the cache.
+        - ttl (float): The default lifetime of an entry in seconds.
+        - generation (Callable, optional): Returns an invalidation counter; the cache is cleared
+          whenever its value changes.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = generation
+        self._seen_generation = generation() if generation else None
+
+    def _sync_generation(self) -> None:
+        if self._generation is not None:
+            current = self._generation()
+            if current != self._seen_generation:
+                self._data.clear()
+                self._seen_generation = current
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key`, or `default` if it is missing or expired.
+
+        Args:
+        - key (Hashable): The cache key.
+        - default (Any): The value to return on a miss.
+
+        Returns:
+        - Any: The cached value or `default`.
+        """
+        with self._lock:
+            self._sync_generation()
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, expires_at: Optional[float] = None
+    ) -> None:
+        """
+        Store `value` under `key`.
+
+        Args:
+        - key (Hashable): The cache key.
+        - value (Any): The value to store.
+        - expires_at (float, optional): Absolute UNIX timestamp at which the entry expires.
+          Defaults to now plus the cache TTL, and is never later than that.
+        """
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._sync_generation()
+            self._data[key] = (value, deadline)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove `key` from the cache if present.
+
+        Args:
+        - key (Hashable): The cache key.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,148 @@
+"""
+Asynchronous Command Runner
+
+Runs external programs (timedatectl, hostnamectl, nmcli, network scripts) without blocking the event loop.
+Every command is started with `asyncio.create_subprocess_exec`, has its output captured, is killed when it
+exceeds its timeout, and waits for a slot in a shared concurrency limit so that a burst of requests cannot
+fork an unbounded number of processes.
+
+The run time of every command is recorded in the `lynxapi_command_duration_seconds` metric, labelled with
+the program name and whether it succeeded, failed or timed out.
+"""
+
+import asyncio
+import os
+import time
+from typing import NamedTuple, Optional, Sequence
+
+from app.core.config import COMMAND_CONCURRENCY, COMMAND_TIMEOUT
+from app.utils.logger import configure_logger
+from app.utils.metrics import command_duration
+
+logger = configure_logger()
+
+
+class CommandResult(NamedTuple):
+    """Outcome of a finished command."""
+
+    args: Sequence[str]
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+class CommandError(Exception):
+    """Raised when a command cannot be started, fails with `check=True`, or times out."""
+
+    def __init__(self, message: str, result: Optional[CommandResult] = None):
+        super().__init__(message)
+        self.result = result
+
+    @property
+    def stderr(self) -> str:
+        return self.result.stderr if self.result else ""
+
+
+class CommandTimeoutError(CommandError):
+    """Raised when a command does not finish within its timeout."""
+
+    pass
+
+
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _command_label(args: Sequence[str]) -> str:
+    # Label `sudo ip ...` as `ip`, and scripts by file name rather than full path.
+    program = args[1] if args[0] == "sudo" and len(args) > 1 else args[0]
+    return os.path.basename(program)
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(COMMAND_CONCURRENCY)
+    return _semaphore
+
+
+async def run_command(
+    args: Sequence[str],
+    timeout: float = COMMAND_TIMEOUT,
+    check: bool = False,
+    input: Optional[bytes] = None,
+) -> CommandResult:
+    """
+    Run a command asynchronously and capture its output.
+
+    Args:
+    - args (Sequence[str]): The program and its arguments. No shell is involved.
+    - timeout (float): Seconds to wait before the process is killed.
+    - check (bool): Raise `CommandError` if the command exits with a non-zero status.
+    - input (bytes, optional): Data written to the command's standard input.
+
+    Returns:
+    - CommandResult: The exit status and decoded stdout/stderr.
+
+    Raises:
+    - CommandTimeoutError: If the command exceeds `timeout`.
+    - CommandError: If the command cannot be started, or fails while `check` is set.
+    """
+    async with _get_semaphore():
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE if input is not None else None,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            command_duration.observe(0.0, _command_label(args), "not_started")
+            raise CommandError(f"Unable to start {args[0]}: {e}")
+
+        started = time.perf_counter()
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(input), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            command_duration.observe(
+                time.perf_counter() - started, _command_label(args), "timeout"
+            )
+            # Only the program is logged, arguments may carry secrets such as Wi-Fi passwords.
+            logger.error(f"Command timed out after {timeout}s: {_command_label(args)}")
+            raise CommandTimeoutError(f"{args[0]} timed out after {timeout}s")
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            command_duration.observe(
+                time.perf_counter() - started, _command_label(args), "cancelled"
+            )
+            raise
+        command_duration.observe(
+            time.perf_counter() - started,
+            _command_label(args),
+            "ok" if process.returncode == 0 else "error",
+        )
+
+    result = CommandResult(
+        args=tuple(args),
+        returncode=process.returncode,
+        stdout=stdout.decode(errors="replace"),
+        stderr=stderr.decode(errors="replace"),
+    )
+    if check and result.returncode != 0:
+        raise CommandError(
+            f"{args[0]} exited with status {result.returncode}: {result.stderr.strip()}",
+            result,
+        )
+    return result
+
+
+__all__ = [
+    "CommandResult",
+    "CommandError",
+    "CommandTimeoutError",
+    "run_command",
+]
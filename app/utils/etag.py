@@ -0,0 +1,82 @@
+"""
+Conditional GET Helpers
+
+Read-only endpoints tag their responses with an `ETag` derived from the versioned state they are built from,
+such as the interface snapshot's digest or the current second for clock data. When a client polls again with
+a matching `If-None-Match` header the endpoint answers `304 Not Modified` before building the response, so an
+unchanged poll skips collection, validation and serialization.
+
+Tags are content digests rather than process-local counters, so every worker process produces the same tag
+for the same data.
+"""
+
+import hashlib
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong entity tag from the state a response is derived from.
+
+    Args:
+        parts: Values with a deterministic `repr`, e.g. strings, numbers, tuples and dicts of them.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's `If-None-Match` header matches `etag`.
+
+    Weak tags (`W/"..."`) compare equal to their strong form, as required for `If-None-Match`.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The current entity tag of the resource.
+
+    Returns:
+        bool: True if the client already holds the current representation.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build a `304 Not Modified` response for `etag`.
+
+    Args:
+        etag (str): The current entity tag of the resource.
+
+    Returns:
+        Response: An empty 304 response carrying the tag.
+    """
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+def etag_headers(etag: str) -> dict:
+    """
+    Return the caching headers sent with every tagged response.
+
+    `no-cache` lets clients store the response but makes them revalidate it on every use.
+
+    Args:
+        etag (str): The current entity tag of the resource.
+    """
+    return {"ETag": etag, "Cache-Control": "no-cache"}
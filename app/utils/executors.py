@@ -0,0 +1,82 @@
+"""
+Bounded Worker Pools
+
+Helpers for running blocking work (password hashing, database lookups) off the event loop in a pool whose
+backlog is capped. When the pool is saturated new work is rejected immediately instead of queueing without
+limit, so that one expensive workload cannot starve the rest of the application.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class PoolFullError(RuntimeError):
+    """Raised when a bounded executor has no free slot for new work."""
+
+    pass
+
+
+class BoundedExecutor:
+    """
+    Thread pool that accepts at most `max_workers + max_pending` jobs at a time.
+
+    Attributes:
+    - max_workers: The number of worker threads.
+    - max_pending: The number of jobs allowed to wait for a free worker.
+    """
+
+    def __init__(
+        self, max_workers: int, max_pending: int, thread_name_prefix: str = ""
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+        - max_workers (int): The number of worker threads.
+        - max_pending (int): The number of jobs allowed to wait for a free worker.
+        - thread_name_prefix (str): Prefix for the worker thread names.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run `func(*args, **kwargs)` in the pool and await its result.
+
+        The slot is held until the worker finishes, even if the awaiting task is cancelled.
+
+        Args:
+        - func (Callable): The blocking callable to run.
+        - *args, **kwargs: Arguments passed to `func`.
+
+        Returns:
+        - Any: The return value of `func`.
+
+        Raises:
+        - PoolFullError: If every slot is in use.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PoolFullError("Worker pool is saturated")
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker threads.
+
+        Args:
+        - wait (bool): Whether to wait for running jobs to finish.
+        """
+        self._executor.shutdown(wait=wait)
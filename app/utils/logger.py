@@ -1,5 +1,41 @@
+"""
+Application Logging
+
+Log calls never touch the disk on the calling thread. `configure_logger` installs a `QueueHandler` on the root
+logger that only puts records on a bounded in-memory queue; a `QueueListener` thread formats them and writes
+them to the console and to a file of JSON lines in `logs/project.log`. A single process rotates the file by
+size; when several Uvicorn workers append to it, rotation is left to logrotate, since a worker renaming the
+file would leave the others writing to the old one.
+
+Repeats of the same warning, i.e. records with the same message from the same call site, are rate-limited: the
+first one in every `LOG_REPEAT_INTERVAL` seconds is logged and the rest are only counted, and the count is
+attached to the next record that gets through as its `suppressed_repeats` attribute. Errors are never
+suppressed. A burst of rejected requests during a scan therefore produces a handful of lines
+instead of one per request. When the queue is full, records are dropped rather than blocking the caller.
+Suppressed and dropped records are counted in the `lynxapi_log_records_suppressed_total` metric.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.core.config import (
+    LOG_BACKUP_COUNT,
+    LOG_MAX_BYTES,
+    LOG_QUEUE_SIZE,
+    LOG_REPEAT_INTERVAL,
+    UVICORN_RELOAD,
+    UVICORN_WORKERS,
+)
+from app.utils.metrics import log_records_suppressed
 
 # get the current dir and go up two level
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -7,26 +43,158 @@ LOG_DIR_PATH = BASE_DIR / "logs"
 # Create the logs directory if it doesn't exist
 LOG_DIR_PATH.mkdir(parents=True, exist_ok=True)
 
+CONSOLE_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_configure_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        repeats = getattr(record, "suppressed_repeats", 0)
+        if repeats:
+            entry["suppressed_repeats"] = repeats
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Formats records for the console, noting how many repeats of them were suppressed."""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        repeats = getattr(record, "suppressed_repeats", 0)
+        if repeats:
+            message = f"{message} (repeated {repeats} more times)"
+        return message
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Rate-limits WARNING records with the same message from the same call site. ERROR and CRITICAL records
+    always pass.
+
+    Attributes:
+    - interval: Seconds during which repeats of a logged record are suppressed.
+    """
+
+    # Bound on the number of distinct warnings tracked at once.
+    MAX_SITES = 1024
+
+    def __init__(self, interval: float = LOG_REPEAT_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._sites: Dict[Tuple[str, int, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not logging.WARNING <= record.levelno < logging.ERROR or self.interval <= 0:
+            return True
+
+        key = (record.pathname, record.lineno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is not None and now - site[0] < self.interval:
+                site[1] += 1
+                log_records_suppressed.inc("repeat")
+                return False
+            if site is None and len(self._sites) >= self.MAX_SITES:
+                self._sites.clear()
+            self._sites[key] = [now, 0]
+        if site is not None and site[1]:
+            record.suppressed_repeats = site[1]
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that drops records instead of failing when the queue is full.
+
+    Attributes:
+    - dropped: The number of records dropped so far.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in this process, so only the message is rendered here and the exception
+        # information is kept for the formatters on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_suppressed.inc("queue_full")
+
+
+def _file_handler() -> logging.Handler:
+    path = LOG_DIR_PATH / "project.log"
+    if UVICORN_WORKERS > 1 and not UVICORN_RELOAD:
+        # Every worker appends to the same file and reopens it when logrotate has moved it.
+        return logging.handlers.WatchedFileHandler(path, encoding="utf-8")
+    return logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
 
 def configure_logger() -> logging.Logger:
     """
     Configures and returns a logger instance for the project.
 
-    Parameters:
-    - log_file (str): Path to the file where logs will be saved. Default is "project_log.log".
+    The logging pipeline is set up on the first call; later calls only return the logger.
 
     Returns:
     - logging.Logger: Configured logger instance for the project.
     """
-    # Set up logging to file
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        encoding="utf-8",
-        handlers=[
-            logging.FileHandler(LOG_DIR_PATH / "project.log"),
-            logging.StreamHandler(),  # This will allow logging to console as well
-        ],
-    )
+    global _listener
+    with _configure_lock:
+        if _listener is None:
+            file_handler = _file_handler()
+            file_handler.setFormatter(JsonFormatter())
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(ConsoleFormatter(CONSOLE_FORMAT))
+
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            queue_handler = DroppingQueueHandler(log_queue)
+            queue_handler.addFilter(RepeatFilter())
+
+            root = logging.getLogger()
+            root.setLevel(logging.INFO)
+            root.addHandler(queue_handler)
+
+            _listener = logging.handlers.QueueListener(
+                log_queue, file_handler, console_handler, respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(_stop_listener)
 
     return logging.getLogger(__name__)
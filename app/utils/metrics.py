@@ -0,0 +1,446 @@
+"""
+Application Metrics
+
+Counters, gauges and histograms for request latency, authentication failures, database queries, external
+commands, psutil collectors and suppressed log records, exported in the Prometheus text format by `render_metrics`.
+
+Recording is lock-free: every metric keeps one shard per thread, which only that thread writes to, and shards
+are merged when the metrics are rendered. A recording is therefore a couple of dictionary and list updates
+with no contention between the event loop and the worker threads running synchronous endpoints.
+
+When several workers run, each one writes a snapshot of its metrics to its own file in `METRICS_DIR` every
+`METRICS_FLUSH_INTERVAL` seconds and on shutdown, and a scrape merges the files of every worker. Counters and
+histograms of workers that have exited stay in the sum so that totals never go backwards; gauges only count
+the workers that are still running.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import (
+    METRICS_DIR,
+    METRICS_FLUSH_INTERVAL,
+    UVICORN_RELOAD,
+    UVICORN_WORKERS,
+)
+
+# Latency buckets in seconds, from fast cache hits to slow external commands.
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_registry: List["Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric(ABC):
+    """
+    Base class of the metric types, holding the per-thread shards.
+
+    Attributes:
+    - name: The exported metric name.
+    - documentation: The help text.
+    - labelnames: The names of the labels; values are passed positionally when recording.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def _snapshots(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict.copy() is atomic under the GIL, so owning threads can keep writing meanwhile.
+        return [shard.copy() for shard in shards]
+
+    @staticmethod
+    def combine(total: Any, value: Any) -> Any:
+        """Return the sum of two values of the metric, e.g. from two worker processes."""
+        return total + value
+
+    @abstractmethod
+    def values(self) -> Dict[Tuple[str, ...], Any]:
+        """Return the merged value for every label combination recorded so far."""
+
+    @abstractmethod
+    def render(self, values: Optional[Dict[Tuple[str, ...], Any]] = None) -> List[str]:
+        """
+        Return the sample lines of the metric in the Prometheus text format.
+
+        Args:
+        - values (dict): The values to render, by default those of this process.
+        """
+
+
+class Counter(Metric):
+    """A value that only increases, such as a number of events."""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """
+        Increase the value for the given label values.
+
+        Args:
+        - labels (str): One value per label name.
+        - amount (float): The amount to add.
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        merged: Dict[Tuple[str, ...], float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                merged[labels] = merged.get(labels, 0.0) + value
+        return merged
+
+    def render(
+        self, values: Optional[Dict[Tuple[str, ...], float]] = None
+    ) -> List[str]:
+        if values is None:
+            values = self.values()
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value:g}"
+            for labels, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    """A value that goes up and down, such as the number of requests in progress."""
+
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """
+        Decrease the value for the given label values.
+
+        Args:
+        - labels (str): One value per label name.
+        - amount (float): The amount to subtract.
+        """
+        self.inc(*labels, amount=-amount)
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: "Histogram", labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values, typically durations in seconds.
+
+    Attributes:
+    - buckets: The upper bounds of the buckets, in increasing order.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation for the given label values.
+
+        Args:
+        - value (float): The observed value.
+        - labels (str): One value per label name.
+        """
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            # One count per bucket, one for +Inf, then the sum of the observations.
+            row = shard[labels] = [0.0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def time(self, *labels: str) -> _Timer:
+        """
+        Return a context manager that observes the duration of its block.
+
+        Args:
+        - labels (str): One value per label name.
+        """
+        return _Timer(self, labels)
+
+    @staticmethod
+    def combine(total: List[float], value: List[float]) -> List[float]:
+        return [a + b for a, b in zip(total, value)]
+
+    def values(self) -> Dict[Tuple[str, ...], List[float]]:
+        merged: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in self._snapshots():
+            for labels, row in shard.items():
+                total = merged.setdefault(labels, [0.0] * len(row))
+                for i, value in enumerate(list(row)):
+                    total[i] += value
+        return merged
+
+    def render(
+        self, values: Optional[Dict[Tuple[str, ...], List[float]]] = None
+    ) -> List[str]:
+        if values is None:
+            values = self.values()
+        lines = []
+        bounds = [f"{b:g}" for b in self.buckets] + ["+Inf"]
+        for labels, row in sorted(values.items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, row):
+                cumulative += count
+                label_text = _format_labels(
+                    self.labelnames + ("le",), labels + (bound,)
+                )
+                lines.append(f"{self.name}_bucket{label_text} {cumulative:g}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {row[-1]:g}")
+            lines.append(f"{self.name}_count{label_text} {cumulative:g}")
+        return lines
+
+
+class MultiprocessMetrics:
+    """
+    Metrics of several worker processes, shared through one snapshot file per process in a directory.
+
+    A snapshot file is named after the process ID and start time of its worker and replaced atomically, so a
+    reader never sees a partial file and a restarted worker never overwrites the totals of its predecessor.
+    Failing to write a snapshot only leaves the previous one in place.
+
+    Attributes:
+    - directory: The directory holding the snapshot files.
+    - interval: Seconds between two snapshots of this process.
+    """
+
+    def __init__(
+        self, directory: str = METRICS_DIR, interval: float = METRICS_FLUSH_INTERVAL
+    ):
+        if not os.path.isdir(os.path.dirname(directory) or "."):
+            directory = os.path.join(tempfile.gettempdir(), os.path.basename(directory))
+        self.directory = directory
+        self.interval = interval
+        self._started = time.time_ns()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"{os.getpid()}-{self._started}.json")
+
+    @staticmethod
+    def _alive(path: str) -> bool:
+        try:
+            os.kill(int(os.path.basename(path).split("-", 1)[0]), 0)
+        except ProcessLookupError:
+            return False
+        except (PermissionError, ValueError):
+            pass
+        return True
+
+    def clear(self) -> None:
+        """Remove the snapshots of a previous run; called once before the workers start."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def write(self) -> None:
+        """Write the current metrics of this process to its snapshot file."""
+        snapshot = {
+            metric.name: [
+                [list(labels), value] for labels, value in metric.values().items()
+            ]
+            for metric in _registry
+        }
+        path = self._path()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(snapshot, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            pass
+
+    def collect(self) -> Dict[str, Dict[Tuple[str, ...], Any]]:
+        """
+        Merge the snapshots of every worker, including this one.
+
+        Returns:
+        - dict: The merged values by label values, by metric name.
+        """
+        self.write()
+        metrics = {metric.name: metric for metric in _registry}
+        merged: Dict[str, Dict[Tuple[str, ...], Any]] = {name: {} for name in metrics}
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = self._alive(path)
+            for metric_name, samples in snapshot.items():
+                metric = metrics.get(metric_name)
+                if metric is None or (metric.type == "gauge" and not alive):
+                    continue
+                values = merged[metric_name]
+                for labels, value in samples:
+                    labels = tuple(labels)
+                    values[labels] = (
+                        metric.combine(values[labels], value)
+                        if labels in values
+                        else value
+                    )
+        return merged
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            self.write()
+
+    def start(self) -> None:
+        """Write a snapshot every `interval` seconds in a background thread."""
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="metrics-snapshot", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and write a last snapshot."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+
+# Only used when several worker processes answer the scrapes.
+multiprocess = (
+    MultiprocessMetrics() if UVICORN_WORKERS > 1 and not UVICORN_RELOAD else None
+)
+
+
+def render_metrics() -> str:
+    """
+    Render every registered metric in the Prometheus text exposition format, merged across the worker
+    processes when several are running.
+
+    Returns:
+    - str: The exposition text.
+    """
+    merged = multiprocess.collect() if multiprocess is not None else {}
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.render(merged.get(metric.name)))
+    return "\n".join(lines) + "\n"
+
+
+request_duration = Histogram(
+    "lynxapi_http_request_duration_seconds",
+    "Time spent answering HTTP requests, by route template.",
+    ("method", "route", "status"),
+)
+requests_in_flight = Gauge(
+    "lynxapi_http_requests_in_flight",
+    "HTTP requests currently being answered, including open streams.",
+)
+auth_failures = Counter(
+    "lynxapi_auth_failures_total",
+    "Rejected authentication attempts, by reason.",
+    ("reason",),
+)
+db_query_duration = Histogram(
+    "lynxapi_db_query_duration_seconds",
+    "Time spent executing database statements, by statement type.",
+    ("operation",),
+)
+command_duration = Histogram(
+    "lynxapi_command_duration_seconds",
+    "Time spent running external commands, by program and outcome.",
+    ("command", "outcome"),
+    buckets=DEFAULT_BUCKETS + (30.0, 60.0),
+)
+collector_duration = Histogram(
+    "lynxapi_collector_duration_seconds",
+    "Time spent collecting system data with psutil, by collector.",
+    ("collector",),
+)
+log_records_suppressed = Counter(
+    "lynxapi_log_records_suppressed_total",
+    "Log records not written, by reason: a repeated warning or a full log queue.",
+    ("reason",),
+)
@@ -0,0 +1,235 @@
+"""
+rtnetlink Helpers
+
+Minimal, dependency-free access to the Linux routing netlink (rtnetlink) protocol: constants, socket
+creation and message framing. It is used to subscribe to kernel notifications about links and addresses,
+and by the netlink network backend to change links, addresses and routes without spawning `ip`.
+
+Requests are sent with `request`, which waits for the kernel's acknowledgement (or collects the replies of
+a dump) and raises `NetlinkError` with the kernel's errno on failure. Changing the configuration requires
+the CAP_NET_ADMIN capability.
+"""
+
+import errno
+import os
+import socket
+import struct
+from typing import Dict, Iterator, List, NamedTuple
+
+# Netlink message header: length, type, flags, sequence number, port id.
+NLMSG_HEADER = struct.Struct("=LHHLL")
+
+# Message flags
+NLM_F_REQUEST = 0x1
+NLM_F_MULTI = 0x2
+NLM_F_ACK = 0x4
+NLM_F_DUMP = 0x300
+NLM_F_REPLACE = 0x100
+NLM_F_EXCL = 0x200
+NLM_F_CREATE = 0x400
+
+# Control message types
+NLMSG_NOOP = 1
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+# rtnetlink message types
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+RTM_NEWROUTE = 24
+RTM_DELROUTE = 25
+
+# Message bodies: ifinfomsg, ifaddrmsg and rtmsg, followed by attributes.
+IFINFOMSG = struct.Struct("=BxHiII")
+IFADDRMSG = struct.Struct("=BBBBI")
+RTMSG = struct.Struct("=BBBBBBBBI")
+RTATTR = struct.Struct("=HH")
+
+IFF_UP = 0x1
+
+# Address attributes
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_BROADCAST = 4
+
+# Route attributes and values
+RTA_DST = 1
+RTA_OIF = 4
+RTA_GATEWAY = 5
+RT_TABLE_MAIN = 254
+RTPROT_BOOT = 3
+RT_SCOPE_UNIVERSE = 0
+RT_SCOPE_LINK = 253
+RT_SCOPE_NOWHERE = 255
+RTN_UNICAST = 1
+
+# rtnetlink multicast groups (legacy bitmask form used with bind())
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+
+LINK_MESSAGES = frozenset({RTM_NEWLINK, RTM_DELLINK})
+ADDRESS_MESSAGES = frozenset({RTM_NEWADDR, RTM_DELADDR})
+
+
+class NetlinkMessage(NamedTuple):
+    """A single netlink message split into its header fields and payload."""
+
+    type: int
+    flags: int
+    seq: int
+    pid: int
+    payload: bytes
+
+
+class NetlinkError(OSError):
+    """Raised when the kernel rejects a netlink request."""
+
+    pass
+
+
+def align(length: int) -> int:
+    """Round `length` up to the 4-byte netlink alignment."""
+    return (length + 3) & ~3
+
+
+def pack_attr(attr_type: int, data: bytes) -> bytes:
+    """Encode a single rtnetlink attribute, padded to the netlink alignment."""
+    length = RTATTR.size + len(data)
+    return RTATTR.pack(length, attr_type) + data + b"\0" * (align(length) - length)
+
+
+def parse_attrs(data: bytes, offset: int = 0) -> Dict[int, bytes]:
+    """
+    Decode the rtnetlink attributes of a message payload.
+
+    Args:
+    - data (bytes): The message payload.
+    - offset (int): Where the attributes start, i.e. the size of the fixed message body.
+
+    Returns:
+    - dict: Attribute payloads keyed by attribute type.
+    """
+    attrs = {}
+    while offset + RTATTR.size <= len(data):
+        length, attr_type = RTATTR.unpack_from(data, offset)
+        if length < RTATTR.size:
+            break
+        attrs[attr_type] = data[offset + RTATTR.size : offset + length]
+        offset += align(length)
+    return attrs
+
+
+def request(
+    sock: socket.socket, msg_type: int, flags: int, payload: bytes, seq: int = 1
+) -> List[NetlinkMessage]:
+    """
+    Send a request and wait until the kernel has answered it.
+
+    Args:
+    - sock (socket.socket): A route socket opened with `open_route_socket()`.
+    - msg_type (int): The RTM_* message type.
+    - flags (int): NLM_F_* flags; NLM_F_REQUEST and NLM_F_ACK are always added.
+    - payload (bytes): The message body and attributes.
+    - seq (int): The sequence number matching replies to this request.
+
+    Returns:
+    - list: The messages returned by a dump request, empty for other requests.
+
+    Raises:
+    - NetlinkError: If the kernel rejected the request.
+    """
+    header = NLMSG_HEADER.pack(
+        NLMSG_HEADER.size + len(payload),
+        msg_type,
+        flags | NLM_F_REQUEST | NLM_F_ACK,
+        seq,
+        0,
+    )
+    sock.send(header + payload)
+
+    replies = []
+    while True:
+        for message in parse_messages(sock.recv(65536)):
+            if message.seq != seq:
+                continue
+            if message.type == NLMSG_ERROR:
+                (error,) = struct.unpack_from("=i", message.payload)
+                if error:
+                    raise NetlinkError(-error, os.strerror(-error))
+                return replies
+            if message.type == NLMSG_DONE:
+                return replies
+            replies.append(message)
+
+
+def ifaddrmsg(family: int, prefixlen: int, index: int, scope: int = 0) -> bytes:
+    """Encode an address message body for the interface with `index`."""
+    return IFADDRMSG.pack(family, prefixlen, 0, scope, index)
+
+
+def ifinfomsg(index: int, flags: int = 0, change: int = 0) -> bytes:
+    """Encode a link message body changing the `change` bits of the link flags to `flags`."""
+    return IFINFOMSG.pack(socket.AF_UNSPEC, 0, index, flags, change)
+
+
+def rtmsg(family: int, dst_len: int, scope: int = RT_SCOPE_UNIVERSE) -> bytes:
+    """Encode a unicast route message body for the main routing table."""
+    return RTMSG.pack(
+        family, dst_len, 0, 0, RT_TABLE_MAIN, RTPROT_BOOT, scope, RTN_UNICAST, 0
+    )
+
+
+def open_route_socket(groups: int = 0) -> socket.socket:
+    """
+    Open an rtnetlink socket, optionally subscribed to multicast groups.
+
+    Args:
+    - groups (int): Bitmask of RTMGRP_* groups to receive notifications for.
+
+    Returns:
+    - socket.socket: The bound netlink socket.
+
+    Raises:
+    - OSError: If netlink is unavailable (non-Linux platforms, restricted sandboxes).
+    """
+    # The netlink constants only exist in the socket module on Linux.
+    if not hasattr(socket, "AF_NETLINK"):
+        raise OSError(errno.EAFNOSUPPORT, "netlink is not supported on this platform")
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    try:
+        sock.bind((0, groups))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def parse_messages(data: bytes) -> Iterator[NetlinkMessage]:
+    """
+    Split a buffer received from a netlink socket into messages.
+
+    Args:
+    - data (bytes): The raw datagram.
+
+    Yields:
+    - NetlinkMessage: Each complete message in the buffer.
+    """
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, flags, seq, pid = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size or offset + length > len(data):
+            break
+        yield NetlinkMessage(
+            msg_type,
+            flags,
+            seq,
+            pid,
+            data[offset + NLMSG_HEADER.size : offset + length],
+        )
+        offset += align(length)
@@ -0,0 +1,55 @@
+"""
+Fast JSON Serialization
+
+Endpoints that return dicts have them validated against their `response_model` and converted by
+`jsonable_encoder` before being encoded, which builds a model instance for every nested object. Responses built
+from collector output already have the documented shape, so those endpoints return a `TrustedJSONResponse`
+instead: FastAPI passes a returned `Response` through untouched, the `response_model` is only used for the
+OpenAPI schema, and the content is encoded in one pass.
+
+Encoding uses orjson when it is installed and falls back to the standard library otherwise, producing the
+same compact output as Starlette's `JSONResponse`.
+"""
+
+import json
+from typing import Any
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def json_dumps(content: Any) -> bytes:
+    """
+    Encode `content` as compact UTF-8 JSON.
+
+    Args:
+    - content: JSON-compatible data; tuples and int enums are encoded as lists and numbers.
+
+    Returns:
+    - bytes: The encoded document.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class TrustedJSONResponse(Response):
+    """
+    JSON response for content that is trusted to match the endpoint's `response_model`.
+
+    The content is encoded as is, without validation. Already encoded `bytes` are sent unchanged, which lets
+    callers reuse a body encoded once per change of the underlying data.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return json_dumps(content)
@@ -0,0 +1,109 @@
+"""
+Cross-process Cache Coherence
+
+When the API runs with several worker processes every worker keeps its own in-memory caches. This module
+keeps them coherent through generation counters stored in a small memory-mapped file (by default on
+`/dev/shm`) that every worker, and the administrative scripts, map into memory.
+
+A writer that changes cached data calls `bump(name)`. Readers remember the generation they last saw and drop
+their local cache when `get(name)` returns a different value. Reading a generation is a single 8-byte
+memory load with no system call, so the check is cheap enough to perform on every cache lookup.
+
+If the shared file cannot be created the counters fall back to process-local memory, which keeps a single
+worker correct.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict
+
+from app.core.config import SHARED_STATE_PATH
+from app.utils.logger import configure_logger
+
+logger = configure_logger()
+
+# Fixed slot per namespace; append new namespaces, never reorder.
+NAMESPACES = ("users", "timezone", "hostname", "interfaces")
+
+_COUNTER = struct.Struct("=Q")
+
+
+class SharedGenerations:
+    """
+    Named generation counters shared by all processes that map the same file.
+
+    Attributes:
+    - path: The file backing the counters, or None when running process-local.
+    """
+
+    def __init__(self, path: str = SHARED_STATE_PATH):
+        self.path = None
+        self._fd = None
+        self._buffer = bytearray(_COUNTER.size * len(NAMESPACES))
+        self._offsets: Dict[str, int] = {
+            name: i * _COUNTER.size for i, name in enumerate(NAMESPACES)
+        }
+        try:
+            self._open(path)
+        except OSError as e:
+            logger.warning(
+                f"Shared cache state unavailable at {path} ({e}), using process-local state"
+            )
+
+    def _open(self, path: str) -> None:
+        if not os.path.isdir(os.path.dirname(path) or "."):
+            path = os.path.join(tempfile.gettempdir(), os.path.basename(path))
+        size = len(self._buffer)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._buffer = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self.path = path
+
+    def get(self, name: str) -> int:
+        """
+        Return the current generation of `name`.
+
+        Args:
+        - name (str): One of `NAMESPACES`.
+
+        Returns:
+        - int: The generation counter.
+        """
+        return _COUNTER.unpack_from(self._buffer, self._offsets[name])[0]
+
+    def bump(self, name: str) -> int:
+        """
+        Increment the generation of `name`, signalling every process that its cached data is stale.
+
+        Args:
+        - name (str): One of `NAMESPACES`.
+
+        Returns:
+        - int: The new generation counter.
+        """
+        offset = self._offsets[name]
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            value = _COUNTER.unpack_from(self._buffer, offset)[0] + 1
+            _COUNTER.pack_into(self._buffer, offset, value)
+        finally:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return value
+
+
+shared_generations = SharedGenerations()
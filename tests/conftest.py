@@ -0,0 +1,7 @@
+import os
+
+# app.core.config requires these settings; the tests never use them for real.
+os.environ.setdefault("API_SECRET_KEY", "test-secret")
+os.environ.setdefault("API_ALGORITHM", "HS256")
+os.environ.setdefault("SCRIPTS_PATH", "/bin/true")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
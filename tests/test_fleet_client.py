@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+import jwt
+
+from app.fleet.client import TOKEN_PATH, FleetClient
+from app.schemas.fleet import FleetDevice
+
+ENDPOINTS = ("/api/device/info", "/api/device/interfaces")
+
+
+class StandInDevice:
+    """A minimal LynxAPI device behind an httpx MockTransport."""
+
+    def __init__(self, password: str = "pw", reachable: bool = True, login_statuses=()):
+        self.password = password
+        self.reachable = reachable
+        # Statuses answered to the first token requests, e.g. while the device is throttling logins.
+        self.login_statuses = list(login_statuses)
+        self.requests = Counter()
+        self.valid_tokens = set()
+
+    def issue_token(self) -> str:
+        token = jwt.encode(
+            {
+                "sub": "admin",
+                "exp": int(time.time()) + 3600,
+                "jti": str(self.requests[TOKEN_PATH]),
+            },
+            "secret",
+            algorithm="HS256",
+        )
+        self.valid_tokens.add(token)
+        return token
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests[request.url.path] += 1
+        if not self.reachable:
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path == TOKEN_PATH:
+            if self.login_statuses:
+                return httpx.Response(self.login_statuses.pop(0))
+            if f"password={self.password}" not in request.content.decode():
+                return httpx.Response(401, json={"detail": "Incorrect credentials"})
+            return httpx.Response(200, json={"access_token": self.issue_token()})
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        if token not in self.valid_tokens:
+            return httpx.Response(401, json={"detail": "Token is invalid"})
+        return httpx.Response(200, json={"path": request.url.path})
+
+
+def stand_in_fleet(devices):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return devices[request.url.host].handle(request)
+
+    return httpx.MockTransport(handler)
+
+
+def device(host: str, password: str = "pw") -> FleetDevice:
+    return FleetDevice(
+        name=host, url=f"http://{host}:8081", username="admin", password=password
+    )
+
+
+def run_query(devices, fleet_devices):
+    async def query():
+        async with FleetClient(transport=stand_in_fleet(devices)) as fleet:
+            return await fleet.query(fleet_devices, ENDPOINTS)
+
+    return asyncio.run(query())
+
+
+def test_query_requests_one_token_per_device():
+    devices = {"a": StandInDevice(), "b": StandInDevice()}
+    report = run_query(devices, [device("a"), device("b")])
+
+    assert report.complete == 2
+    for device_report in report.devices:
+        assert device_report.results == {path: {"path": path} for path in ENDPOINTS}
+    for stand_in in devices.values():
+        assert stand_in.requests[TOKEN_PATH] == 1
+
+
+def test_rejected_credentials_are_not_retried_per_endpoint():
+    devices = {"a": StandInDevice(), "b": StandInDevice(password="other")}
+    report = run_query(devices, [device("a"), device("b")])
+
+    assert report.complete == 1
+    assert report.failed == 1
+    assert report.devices[1].errors == {
+        path: "Authentication failed with HTTP 401." for path in ENDPOINTS
+    }
+    assert devices["b"].requests[TOKEN_PATH] == 1
+
+
+def test_throttled_login_is_retried_by_the_next_endpoint():
+    devices = {"a": StandInDevice(login_statuses=[429])}
+    report = run_query(devices, [device("a")])
+
+    errors, results = report.devices[0].errors, report.devices[0].results
+    assert list(errors.values()) == ["Authentication failed with HTTP 429."]
+    assert len(results) == len(ENDPOINTS) - 1
+    assert devices["a"].requests[TOKEN_PATH] == 2
+
+
+def test_rejected_token_is_renewed_once():
+    devices = {"a": StandInDevice()}
+
+    async def query():
+        async with FleetClient(transport=stand_in_fleet(devices)) as fleet:
+            first = await fleet.query([device("a")], ENDPOINTS)
+            # The device restarted with a new secret key and forgot every token.
+            devices["a"].valid_tokens.clear()
+            second = await fleet.query([device("a")], ENDPOINTS)
+            return first, second
+
+    first, second = asyncio.run(query())
+
+    assert first.complete == 1
+    assert second.complete == 1
+    assert devices["a"].requests[TOKEN_PATH] == 2
+
+
+def test_unreachable_device_does_not_fail_the_fleet():
+    devices = {"a": StandInDevice(), "b": StandInDevice(reachable=False)}
+    report = run_query(devices, [device("a"), device("b")])
+
+    assert report.complete == 1
+    assert report.failed == 1
+    assert all(
+        error.startswith("Request failed: ConnectError")
+        for error in report.devices[1].errors.values()
+    )
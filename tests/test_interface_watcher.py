@@ -0,0 +1,53 @@
+import asyncio
+import errno
+import socket
+
+from app.collectors import interface_watcher as watcher_module
+from app.collectors.interfaces import InterfaceSnapshot
+from app.collectors.interface_watcher import InterfaceWatcher
+
+
+class FailingSocket:
+    """One end of a socket pair standing in for the netlink socket, failing every receive."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.closed = False
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def setblocking(self, flag: bool) -> None:
+        self.sock.setblocking(flag)
+
+    def recv(self, size: int) -> bytes:
+        raise OSError(errno.EIO, "Input/output error")
+
+    def close(self) -> None:
+        self.closed = True
+        self.sock.close()
+
+
+def test_socket_error_falls_back_to_ttl_polling(monkeypatch):
+    ours, peer = socket.socketpair()
+    failing = FailingSocket(ours)
+    monkeypatch.setattr(
+        watcher_module.netlink, "open_route_socket", lambda groups: failing
+    )
+    snapshot = InterfaceSnapshot()
+    watcher = InterfaceWatcher(snapshot, debounce=0)
+
+    async def run():
+        assert await watcher.start()
+        assert snapshot.watched
+        peer.send(b"notification")
+        await asyncio.sleep(0.05)
+        stopped = not watcher.running
+        await watcher.stop()
+        return stopped
+
+    assert asyncio.run(run())
+    assert failing.closed
+    assert not snapshot.watched
+    assert snapshot.is_stale()
+    peer.close()
@@ -0,0 +1,51 @@
+import json
+import subprocess
+
+from app.utils.metrics import (
+    MultiprocessMetrics,
+    auth_failures,
+    request_duration,
+    requests_in_flight,
+    render_metrics,
+)
+
+
+def exited_pid() -> int:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+def test_snapshots_of_all_workers_are_merged(tmp_path):
+    multiprocess = MultiprocessMetrics(str(tmp_path), interval=60)
+    auth_failures.inc("invalid_token")
+    request_duration.observe(0.002, "GET", "/api/device/time", "200")
+    requests_in_flight.inc()
+    own = auth_failures.values()[("invalid_token",)]
+    # A worker that has exited: its totals stay in the sum, its gauges do not.
+    (tmp_path / f"{exited_pid()}-1.json").write_text(
+        json.dumps(
+            {
+                auth_failures.name: [[["invalid_token"], 2.0]],
+                request_duration.name: [
+                    [["GET", "/api/device/time", "200"], [0.0, 1.0] + [0.0] * 13]
+                ],
+                requests_in_flight.name: [[[], 5.0]],
+            }
+        )
+    )
+
+    merged = multiprocess.collect()
+
+    assert merged[auth_failures.name][("invalid_token",)] == own + 2
+    row = merged[request_duration.name][("GET", "/api/device/time", "200")]
+    assert (
+        row[1] == request_duration.values()[("GET", "/api/device/time", "200")][1] + 1
+    )
+    assert merged[requests_in_flight.name][()] == requests_in_flight.values()[()]
+    requests_in_flight.dec()
+
+
+def test_single_worker_renders_its_own_metrics():
+    auth_failures.inc("expired_token")
+    assert 'lynxapi_auth_failures_total{reason="expired_token"}' in render_metrics()
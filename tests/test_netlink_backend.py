@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "geteuid")
+    or os.geteuid() != 0
+    or not shutil.which("unshare")
+    or not shutil.which("ip"),
+    reason="needs root, unshare and ip to create a network namespace",
+)
+
+# Runs inside a new network namespace, on a veth pair, and prints the state after every step.
+NAMESPACE_SCRIPT = """
+import asyncio, ipaddress, json, subprocess
+
+from app.network.backends import NetlinkBackend, NetworkBackendError
+from app.network.state import read_default_route
+
+subprocess.run("ip link add v0 type veth peer name v1 && ip link set v1 up", shell=True, check=True)
+backend = NetlinkBackend()
+backend.set_link_state("v0", True)
+
+
+def state():
+    route = read_default_route()
+    return {
+        "addresses": [str(a) for a in backend.list_addresses("v0", version=4)],
+        "route": [route.interface, str(route.gateway)] if route else None,
+    }
+
+
+async def configure(address, gateway):
+    try:
+        await backend.configure_static(
+            "v0", ipaddress.IPv4Interface(address), ipaddress.IPv4Address(gateway)
+        )
+    except NetworkBackendError as e:
+        return {"error": str(e), **state()}
+    return state()
+
+
+async def main():
+    return {
+        "configure": await configure("192.168.1.10/24", "192.168.1.1"),
+        "same_subnet": await configure("192.168.1.20/24", "192.168.1.1"),
+        "new_subnet": await configure("10.0.0.5/24", "10.0.0.1"),
+        "unreachable_gateway": await configure("172.16.0.5/24", "192.168.99.1"),
+    }
+
+
+print(json.dumps(asyncio.run(main())))
+"""
+
+
+@pytest.fixture(scope="module")
+def results():
+    completed = subprocess.run(
+        ["unshare", "-n", sys.executable, "-c", NAMESPACE_SCRIPT],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    if completed.returncode != 0 and "Operation not permitted" in completed.stderr:
+        pytest.skip("network namespaces are not permitted here")
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_configure_static_sets_address_and_default_route(results):
+    assert results["configure"] == {
+        "addresses": ["192.168.1.10/24"],
+        "route": ["v0", "192.168.1.1"],
+    }
+
+
+def test_readdress_in_same_subnet_keeps_default_route(results):
+    assert results["same_subnet"] == {
+        "addresses": ["192.168.1.20/24"],
+        "route": ["v0", "192.168.1.1"],
+    }
+
+
+def test_readdress_to_new_subnet_moves_default_route(results):
+    assert results["new_subnet"] == {
+        "addresses": ["10.0.0.5/24"],
+        "route": ["v0", "10.0.0.1"],
+    }
+
+
+def test_failed_configuration_restores_previous_one(results):
+    outcome = results["unreachable_gateway"]
+    assert outcome.pop("error")
+    assert outcome == {"addresses": ["10.0.0.5/24"], "route": ["v0", "10.0.0.1"]}
@@ -0,0 +1,118 @@
+from ipaddress import IPv4Address, ip_interface
+
+import pytest
+
+from app.network.state import (
+    DefaultRoute,
+    LinkState,
+    NetworkStateError,
+    plan_changes,
+)
+from app.schemas.network_state import NetworkState
+
+GATEWAY_ROUTE = DefaultRoute("eth0", IPv4Address("192.168.1.1"))
+
+
+def links(*addresses, up=True, mtu=1500):
+    return {
+        "eth0": LinkState(
+            "eth0", up, mtu, frozenset(ip_interface(a) for a in addresses)
+        )
+    }
+
+
+def desired(**interface):
+    return NetworkState(interfaces=[{"name": "eth0", **interface}])
+
+
+def commands(changes):
+    return [change.command for change in changes]
+
+
+def test_readdress_in_same_subnet_restores_default_route():
+    changes = plan_changes(
+        desired(addresses=["192.168.1.20/24"], gateway="192.168.1.1"),
+        links("192.168.1.10/24"),
+        GATEWAY_ROUTE,
+    )
+
+    # The new address follows the removal, which would otherwise delete it as a secondary address.
+    assert commands(changes) == [
+        "address del 192.168.1.10/24 dev eth0",
+        "address add 192.168.1.20/24 broadcast + dev eth0",
+        "route replace default via 192.168.1.1 dev eth0",
+    ]
+
+
+def test_readdress_adds_new_subnet_before_removing_old_one():
+    changes = plan_changes(
+        desired(addresses=["192.168.1.10/24", "10.0.0.5/24", "fd00::5/64"]),
+        links("192.168.1.10/24", "172.16.0.5/16", "fe80::1/64"),
+        GATEWAY_ROUTE,
+    )
+
+    # The link-local address is kept, and the gateway stays reachable, so no route change is needed.
+    assert commands(changes) == [
+        "address add 10.0.0.5/24 broadcast + dev eth0",
+        "address add fd00::5/64 dev eth0",
+        "address del 172.16.0.5/16 dev eth0",
+    ]
+
+
+def test_removing_gateway_address_restores_default_route():
+    changes = plan_changes(
+        desired(addresses=["192.168.2.10/24"]),
+        links("192.168.1.10/24"),
+        GATEWAY_ROUTE,
+    )
+
+    assert commands(changes)[-1] == "route replace default via 192.168.1.1 dev eth0"
+
+
+def test_new_gateway_replaces_route_once():
+    changes = plan_changes(
+        desired(addresses=["10.0.0.5/24"], gateway="10.0.0.1"),
+        links("192.168.1.10/24"),
+        GATEWAY_ROUTE,
+    )
+
+    assert commands(changes) == [
+        "address add 10.0.0.5/24 broadcast + dev eth0",
+        "address del 192.168.1.10/24 dev eth0",
+        "route replace default via 10.0.0.1 dev eth0",
+    ]
+
+
+def test_reapplying_current_state_changes_nothing():
+    state = desired(
+        up=True, mtu=1500, addresses=["192.168.1.10/24"], gateway="192.168.1.1"
+    )
+
+    assert (
+        plan_changes(state, links("192.168.1.10/24", "fe80::1/64"), GATEWAY_ROUTE) == []
+    )
+
+
+def test_undo_restores_previous_state_in_reverse_order():
+    changes = plan_changes(
+        desired(mtu=9000, addresses=["192.168.1.20/24"], gateway="192.168.1.1"),
+        links("192.168.1.10/24"),
+        GATEWAY_ROUTE,
+    )
+
+    # `rollback` runs the undo lines of the applied changes, most recent first.
+    undo = [line for change in reversed(changes) for line in change.undo.split("\n")]
+    assert undo == [
+        "route replace default via 192.168.1.1 dev eth0",
+        "address del 192.168.1.20/24 dev eth0",
+        "address add 192.168.1.10/24 broadcast + dev eth0",
+        "route replace default via 192.168.1.1 dev eth0",
+        "link set dev eth0 mtu 1500",
+    ]
+
+
+def test_unknown_interface_is_rejected():
+    with pytest.raises(NetworkStateError):
+        plan_changes(
+            NetworkState(interfaces=[{"name": "eth9", "up": True}]), links(), None
+        )
@@ -0,0 +1,47 @@
+import asyncio
+from ipaddress import IPv4Address, IPv4Interface
+
+from app.network.backends import NetlinkBackend, ScriptBackend
+
+
+class RecordingScriptBackend(ScriptBackend):
+    def __init__(self):
+        super().__init__(script="network-config.sh")
+        self.calls = []
+
+    async def _run(self, args):
+        self.calls.append(args)
+
+
+def test_static_arguments_match_network_script():
+    backend = RecordingScriptBackend()
+    asyncio.run(
+        backend.configure_static(
+            "eth0",
+            IPv4Interface("192.168.1.10/24"),
+            IPv4Address("192.168.1.1"),
+            [IPv4Address("1.1.1.1"), IPv4Address("9.9.9.9")],
+        )
+    )
+
+    # network-config.sh reads the DNS servers as $5 and the gateway as $6.
+    assert backend.calls == [
+        ["eth0", "static", "192.168.1.10", "24", "1.1.1.1 9.9.9.9", "192.168.1.1"]
+    ]
+
+
+def test_netlink_backend_hands_dns_servers_to_script():
+    script = RecordingScriptBackend()
+    backend = NetlinkBackend(script_backend=script)
+    asyncio.run(
+        backend.configure_static(
+            "eth0",
+            IPv4Interface("192.168.1.10/24"),
+            IPv4Address("192.168.1.1"),
+            [IPv4Address("1.1.1.1")],
+        )
+    )
+
+    assert script.calls == [
+        ["eth0", "static", "192.168.1.10", "24", "1.1.1.1", "192.168.1.1"]
+    ]